@@ -6,7 +6,7 @@ Version améliorée avec thème sombre et nouvelles fonctionnalités
 import streamlit as st
 from database_schema import DatabaseSchema, format_duration
 from programme_learning_v2 import ProgrammeService, ProgressionService
-from import_programme import exporter_progression
+from import_programme import exporter_progression, importer_progression
 import os
 
 # ============================================================================
@@ -143,10 +143,18 @@ def init_database():
         db = DatabaseInitializer.initialize_new_database(db_path)
         migrator = ProgrammeMigrator(db)
         migrator.migrate_all()
+        db.disconnect()
         st.success("✅ Base de données créée avec succès!")
     
+    # Connexion de l'exécution précédente : ses callbacks de boutons viennent de
+    # s'exécuter (avant le script), elle peut maintenant être rendue au pool
+    precedente = st.session_state.pop('_db_execution', None)
+    if precedente is not None:
+        precedente.disconnect()
+    
     db = DatabaseSchema(db_path)
     db.connect()
+    st.session_state['_db_execution'] = db
     return db
 
 # Initialiser
@@ -169,11 +177,48 @@ def get_status_badge(statut):
     else:
         return '<span class="status-badge status-non-commence">⏳ Non commencé</span>'
 
+# Étoiles de difficulté pré-calculées (niveaux 1 à 5)
+_STARS = [""] + [f'<span class="difficulty-stars">{"⭐" * n}</span>' for n in range(1, 6)]
+
+def get_difficulty_stars(difficulte):
+    """Retourne les étoiles HTML correspondant au niveau de difficulté"""
+    if not difficulte:
+        return ""
+    if difficulte < len(_STARS):
+        return _STARS[difficulte]
+    return f'<span class="difficulty-stars">{"⭐" * difficulte}</span>'
+
+@st.cache_data(ttl=30, show_spinner=False)
+def get_home_bundle_cached(prog_id):
+    """Données de la page d'accueil, mises en cache entre deux écritures"""
+    return programme_service.get_home_bundle(prog_id)
+
+@st.cache_data(ttl=30, show_spinner=False)
+def get_progression_stats_cached(prog_id):
+    """Statistiques de progression, mises en cache entre deux écritures"""
+    return progression_service.prog_dao.get_progression_programme(prog_id)
+
+def invalider_caches():
+    """Vide les caches dépendant de la progression (à appeler après chaque écriture)"""
+    get_home_bundle_cached.clear()
+    get_progression_stats_cached.clear()
+
 def marquer_en_cours(contenu_id):
-    """Marque un contenu comme en cours"""
+    """Marque un contenu comme en cours (callback de bouton, sans st.rerun)"""
     progression_service.prog_dao.marquer_commence(contenu_id)
-    st.success("📝 Marqué comme en cours !")
-    st.rerun()
+    invalider_caches()
+    st.toast("📝 Marqué comme en cours !")
+
+def selectionner_contenu(cle, contenu_id):
+    """Mémorise un contenu dans la session (callback de bouton, sans st.rerun)"""
+    st.session_state[cle] = contenu_id
+
+# ============================================================================
+# STATISTIQUES GLOBALES (partagées par la sidebar et l'accueil)
+# ============================================================================
+
+stats = get_progression_stats_cached(PROG_ID)
+pourcentage = (stats['contenus_termines'] / stats['total_contenus'] * 100) if stats['total_contenus'] > 0 else 0
 
 # ============================================================================
 # SIDEBAR : Navigation
@@ -196,10 +241,6 @@ page = st.sidebar.radio(
 
 st.sidebar.markdown("---")
 
-# Statistiques globales dans la sidebar
-stats = progression_service.prog_dao.get_progression_programme(PROG_ID)
-pourcentage = (stats['contenus_termines'] / stats['total_contenus'] * 100) if stats['total_contenus'] > 0 else 0
-
 st.sidebar.markdown("### 📈 Progression globale")
 st.sidebar.progress(pourcentage / 100)
 st.sidebar.write(f"**{pourcentage:.0f}%** complété")
@@ -220,9 +261,11 @@ if page == "🏠 Accueil":
     st.markdown('<h1 class="gradient-title">📚 Programme d\'apprentissage Python</h1>', unsafe_allow_html=True)
     st.markdown("### Apprenez Python en 30 jours avec un programme structuré")
     
-    prog = programme_service.prog_dao.get_programme_with_stats(PROG_ID)
+    bundle = get_home_bundle_cached(PROG_ID)
     
-    if prog:
+    if bundle:
+        prog = bundle['programme']
+        
         # Métriques en colonnes
         col1, col2, col3, col4 = st.columns(4)
         
@@ -285,7 +328,7 @@ if page == "🏠 Accueil":
         
         # Suggestion de contenu
         st.subheader("💡 Prochain contenu suggéré")
-        prochain = programme_service.suggerer_prochain_contenu(PROG_ID)
+        prochain = bundle['prochain']
         
         if prochain:
             st.markdown('<div class="content-card">', unsafe_allow_html=True)
@@ -306,22 +349,19 @@ if page == "🏠 Accueil":
                 st.write(f"**{type_texte}**")
                 
                 if prochain['difficulte']:
-                    st.markdown(f'<span class="difficulty-stars">{"⭐" * prochain['difficulte']}</span>', unsafe_allow_html=True)
+                    st.markdown(get_difficulty_stars(prochain['difficulte']), unsafe_allow_html=True)
                 
                 if prochain['temps_estime']:
                     st.write(f"⏱️ **Temps estimé**: {format_duration(prochain['temps_estime'])}")
             
             with col2:
                 # Vérifier le statut actuel
-                prog_actuelle = progression_service.prog_dao.get_progression(prochain['id'])
+                if bundle['statut_prochain'] in (None, 'non_commence'):
+                    st.button("📝 Commencer", key="start_prochain", use_container_width=True,
+                              on_click=marquer_en_cours, args=(prochain['id'],))
                 
-                if not prog_actuelle or prog_actuelle['statut'] == 'non_commence':
-                    if st.button("📝 Commencer", key="start_prochain", use_container_width=True):
-                        marquer_en_cours(prochain['id'])
-                
-                if st.button("📖 Voir détails", key="detail_prochain", use_container_width=True):
-                    st.session_state['voir_detail_id'] = prochain['id']
-                    st.rerun()
+                st.button("📖 Voir détails", key="detail_prochain", use_container_width=True,
+                          on_click=selectionner_contenu, args=('voir_detail_id', prochain['id']))
             
             if prochain['description']:
                 st.write(prochain['description'])
@@ -342,17 +382,19 @@ if page == "🏠 Accueil":
                             st.info(f"💡 {prochain['indice']}")
                     
                     # Prérequis
-                    prerequis = programme_service.contenu_dao.get_prerequis(prochain['id'])
+                    prerequis = bundle['prerequis']
                     if prerequis:
                         st.markdown("**🔗 Prérequis:**")
                         for prereq in prerequis:
-                            prog_prereq = progression_service.prog_dao.get_progression(prereq['id'])
-                            statut = "✅" if prog_prereq and prog_prereq['statut'] == 'termine' else "⚠️"
+                            statut = "✅" if prereq['statut_progression'] == 'termine' else "⚠️"
                             st.write(f"{statut} {prereq['titre']}")
         else:
             st.markdown('<div class="content-card">', unsafe_allow_html=True)
             st.success("🎉 Félicitations ! Vous avez terminé tout le programme !")
-            st.balloons()
+            # Une seule animation par session, pas à chaque rerun
+            if not st.session_state.get('balloons_affiches'):
+                st.session_state['balloons_affiches'] = True
+                st.balloons()
             st.markdown('</div>', unsafe_allow_html=True)
 
 # ============================================================================
@@ -430,7 +472,7 @@ elif page == "📅 Semaines":
                             else:
                                 badge = get_status_badge('non_commence')
                             
-                            difficulte = f'<span class="difficulty-stars">{"⭐" * e["difficulte"]}</span>' if e['difficulte'] else ""
+                            difficulte = get_difficulty_stars(e['difficulte'])
                             temps = f"({format_duration(e['temps_estime'])})" if e['temps_estime'] else ""
                             
                             col1, col2 = st.columns([4, 1])
@@ -440,8 +482,8 @@ elif page == "📅 Semaines":
                                     st.caption(f"└─ {e['description']}")
                             with col2:
                                 if not prog or prog['statut'] == 'non_commence':
-                                    if st.button("▶️", key=f"start_{e['id']}", help="Commencer"):
-                                        marquer_en_cours(e['id'])
+                                    st.button("▶️", key=f"start_{e['id']}", help="Commencer",
+                                              on_click=marquer_en_cours, args=(e['id'],))
                     
                     if projets:
                         st.markdown("#### 🎯 Projet")
@@ -452,7 +494,7 @@ elif page == "📅 Semaines":
                             else:
                                 badge = get_status_badge('non_commence')
                             
-                            difficulte = f'<span class="difficulty-stars">{"⭐" * p["difficulte"]}</span>' if p['difficulte'] else ""
+                            difficulte = get_difficulty_stars(p['difficulte'])
                             temps = f"({format_duration(p['temps_estime'])})" if p['temps_estime'] else ""
                             st.markdown(f"{badge} **{p['titre']}** {difficulte} {temps}", unsafe_allow_html=True)
                             
@@ -590,21 +632,46 @@ elif page == "📊 Ma progression":
         
             except Exception as e:
                 st.error(f"❌ Erreur: {str(e)}")
+        
+        if st.button("📦 Exporter tous les programmes"):
+            from import_programme import exporter_progressions_batch
+            import io
+            import zipfile
+            
+            try:
+                # Un export par programme, en parallèle sur des connexions en lecture seule
+                prog_ids = [p['id'] for p in programme_service.prog_dao.get_all_programmes()]
+                exports = exporter_progressions_batch(db.db_path, prog_ids)
+                
+                # Une archive ZIP : un fichier JSON par programme
+                archive = io.BytesIO()
+                with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as zf:
+                    for prog_id, json_data in exports.items():
+                        zf.writestr(f"progression_{prog_id}.json", json_data)
+                
+                st.download_button(
+                    label="💾 Télécharger l'archive ZIP",
+                    data=archive.getvalue(),
+                    file_name="progressions.zip",
+                    mime="application/zip"
+                )
+                st.success(f"✅ {len(exports)} programme(s) exporté(s) !")
+            
+            except Exception as e:
+                st.error(f"❌ Erreur: {str(e)}")
     
     with col2:
         fichier_import = st.file_uploader("📤 Importer une progression", type=['json'])
         if fichier_import:
             if st.button("🔄 Importer", use_container_width=True):
-                #from import_programme import importer_progression
-                import json as json_lib
-                
-                try:
-                    data = json_lib.load(fichier_import)
-                    stats_import = importer_progression(db, data)
+                # Octets bruts du fichier : le document est parcouru directement par SQLite
+                stats_import = importer_progression(db, fichier_import.getvalue())
+                if stats_import["succes"]:
+                    invalider_caches()
                     st.success(f"✅ {stats_import['nb_importes']} progressions importées !")
                     st.rerun()
-                except Exception as e:
-                    st.error(f"❌ Erreur lors de l'import : {e}")
+                else:
+                    st.error(f"❌ Erreur lors de l'import : {stats_import['erreur']}")
     
     st.info("💡 **Astuce** : Exportez votre progression avant de changer de programme ou de réinitialiser la base de données")
     
@@ -711,7 +778,7 @@ elif page == "🔍 Recherche":
                             st.write(contenu['description'])
                         
                         if contenu['difficulte']:
-                            st.markdown(f'**Difficulté**: <span class="difficulty-stars">{"⭐" * contenu["difficulte"]}</span>', unsafe_allow_html=True)
+                            st.markdown(f"**Difficulté**: {get_difficulty_stars(contenu['difficulte'])}", unsafe_allow_html=True)
                         
                         if contenu['temps_estime']:
                             st.write(f"**Temps estimé**: {format_duration(contenu['temps_estime'])}")
@@ -719,11 +786,10 @@ elif page == "🔍 Recherche":
                     with col2:
                         if not prog or prog['statut'] != 'termine':
                             if not prog or prog['statut'] == 'non_commence':
-                                if st.button("▶️ Commencer", key=f"start_{contenu['id']}", use_container_width=True):
-                                    marquer_en_cours(contenu['id'])
-                            if st.button("✅ Valider", key=f"val_{contenu['id']}", use_container_width=True):
-                                st.session_state['valider_contenu_id'] = contenu['id']
-                                st.rerun()
+                                st.button("▶️ Commencer", key=f"start_{contenu['id']}", use_container_width=True,
+                                          on_click=marquer_en_cours, args=(contenu['id'],))
+                            st.button("✅ Valider", key=f"val_{contenu['id']}", use_container_width=True,
+                                      on_click=selectionner_contenu, args=('valider_contenu_id', contenu['id']))
         else:
             st.warning(f"Aucun résultat pour '{terme}'")
 
@@ -800,7 +866,7 @@ elif page == "✅ Valider un contenu":
                     st.write(contenu['description'])
                 
                 if contenu['difficulte']:
-                    st.markdown(f'**Difficulté**: <span class="difficulty-stars">{"⭐" * contenu["difficulte"]}</span>', unsafe_allow_html=True)
+                    st.markdown(f"**Difficulté**: {get_difficulty_stars(contenu['difficulte'])}", unsafe_allow_html=True)
             
             with col2:
                 if contenu['temps_estime']:
@@ -843,6 +909,7 @@ elif page == "✅ Valider un contenu":
                         temps_passe,
                         notes
                     )
+                    invalider_caches()
                     st.success(f"🎉 '{contenu['titre']}' marqué comme terminé!")
                     
                     # Afficher contenus débloqués
@@ -901,15 +968,23 @@ elif page == "📥 Importer un programme":
                 import io
                 
                 try:
-                    # Lire le CSV
-                    content = fichier_csv.getvalue().decode('utf-8')
-                    csv_file = io.StringIO(content)
+                    # Décodage à la volée par blocs, sans copie str du fichier entier
+                    fichier_csv.seek(0)
+                    csv_file = io.TextIOWrapper(fichier_csv, encoding='utf-8', newline='')
                     
                     # Importer
                     importer = ProgrammeImporter(db)
-                    stats = importer.importer_depuis_csv(csv_file, nom_programme, sujet_programme)
+                    try:
+                        # Import rejouable (IDs déterministes) : PRAGMAs d'écriture massive
+                        stats = importer.importer_depuis_csv(
+                            csv_file, nom_programme, sujet_programme, fast_mode=True
+                        )
+                    finally:
+                        # Rendre le fichier téléversé à Streamlit sans le fermer
+                        csv_file.detach()
                     
                     if stats['succes']:
+                        invalider_caches()
                         st.success(f"""
                         ✅ **Import réussi !**
                         
@@ -4,9 +4,167 @@ Gère les programmes, semaines, jours, contenus, prérequis et progression
 """
 
 import sqlite3
+import re
 from datetime import datetime
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
 from typing import Optional
 import os
+import threading
+
+
+# Réglages appliqués à chaque nouvelle connexion :
+# WAL (lecteurs non bloqués par l'écrivain), cache de 64 Mo, temporaires en mémoire
+_PRAGMAS_CONNEXION = """
+    PRAGMA foreign_keys = ON;
+    PRAGMA journal_mode = WAL;
+    PRAGMA synchronous = NORMAL;
+    PRAGMA cache_size = -64000;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA busy_timeout = 5000;
+    PRAGMA mmap_size = 268435456;
+"""
+
+
+# Réglages temporaires d'une écriture massive (import CSV, migration), posés par
+# apply_bulk_pragmas et annulés par restore_pragmas, en plus de _PRAGMAS_CONNEXION :
+# aucun fsync (l'écriture peut être rejouée : IDs déterministes) et cache porté à
+# 256 Mo pour les pages d'index. Pas de locking_mode = EXCLUSIVE : en WAL, chaque
+# connexion ouverte du pool garde un verrou partagé et l'écriture échouerait
+_PRAGMAS_ECRITURE_MASSIVE = {
+    "synchronous": "OFF",
+    "cache_size": -262144,
+}
+
+
+# Schéma complet (tables + index), exécuté en une fois par create_tables
+_SCHEMA_SQL = """
+BEGIN;
+
+-- Table 1 : PROGRAMMES
+CREATE TABLE IF NOT EXISTS programmes (
+    id TEXT PRIMARY KEY,
+    titre TEXT NOT NULL,
+    sujet TEXT NOT NULL,
+    duree_jours INTEGER,
+    niveau TEXT,
+    temps_quotidien INTEGER,
+    description TEXT,
+    date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    actif INTEGER DEFAULT 1
+);
+
+-- Table 2 : SEMAINES
+CREATE TABLE IF NOT EXISTS semaines (
+    id TEXT PRIMARY KEY,
+    programme_id TEXT NOT NULL,
+    numero INTEGER NOT NULL,
+    titre TEXT NOT NULL,
+    objectif TEXT,
+    temps_quotidien TEXT,
+    ordre INTEGER,
+    FOREIGN KEY (programme_id) REFERENCES programmes(id) ON DELETE CASCADE
+);
+
+-- Table 3 : JOURS
+CREATE TABLE IF NOT EXISTS jours (
+    id TEXT PRIMARY KEY,
+    semaine_id TEXT NOT NULL,
+    nom TEXT NOT NULL,
+    type TEXT DEFAULT 'normal',
+    ordre INTEGER,
+    FOREIGN KEY (semaine_id) REFERENCES semaines(id) ON DELETE CASCADE
+);
+
+-- Table 4 : CONTENUS
+CREATE TABLE IF NOT EXISTS contenus (
+    id TEXT PRIMARY KEY,
+    jour_id TEXT NOT NULL,
+    type TEXT NOT NULL,
+    titre TEXT NOT NULL,
+    description TEXT,
+    enonce TEXT,
+    indice TEXT,
+    difficulte INTEGER,
+    temps_estime INTEGER,
+    ordre INTEGER,
+    FOREIGN KEY (jour_id) REFERENCES jours(id) ON DELETE CASCADE
+);
+
+-- Table 5 : PREREQUIS (relation many-to-many)
+-- WITHOUT ROWID : la clé naturelle est l'unique B-tree de la table
+CREATE TABLE IF NOT EXISTS prerequis (
+    contenu_id TEXT NOT NULL,
+    prerequis_contenu_id TEXT NOT NULL,
+    obligatoire INTEGER DEFAULT 1,
+    PRIMARY KEY (contenu_id, prerequis_contenu_id),
+    FOREIGN KEY (contenu_id) REFERENCES contenus(id) ON DELETE CASCADE,
+    FOREIGN KEY (prerequis_contenu_id) REFERENCES contenus(id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+-- Table 6 : PROGRESSION (une ligne par contenu)
+CREATE TABLE IF NOT EXISTS progression (
+    contenu_id TEXT NOT NULL PRIMARY KEY,
+    statut TEXT DEFAULT 'non_commence',
+    date_debut TIMESTAMP,
+    date_completion TIMESTAMP,
+    notes TEXT,
+    temps_passe INTEGER DEFAULT 0,
+    FOREIGN KEY (contenu_id) REFERENCES contenus(id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+-- Index pour optimiser les requêtes fréquentes
+-- (parent, ordre) : parcours ordonné sans tri temporaire (remplacent les index mono-colonne)
+DROP INDEX IF EXISTS idx_semaines_programme;
+DROP INDEX IF EXISTS idx_jours_semaine;
+DROP INDEX IF EXISTS idx_contenus_jour;
+CREATE INDEX IF NOT EXISTS idx_semaines_programme_ordre ON semaines(programme_id, ordre);
+CREATE INDEX IF NOT EXISTS idx_jours_semaine_ordre ON jours(semaine_id, ordre);
+CREATE INDEX IF NOT EXISTS idx_contenus_jour_ordre ON contenus(jour_id, ordre);
+-- Couverts par les clés primaires de prerequis et progression
+DROP INDEX IF EXISTS idx_prerequis_contenu;
+DROP INDEX IF EXISTS idx_progression_contenu;
+
+COMMIT;
+"""
+
+
+# Connexions inactives réutilisables, par chemin de fichier : évite de rouvrir
+# .db/-wal/-shm à chaque opération et garde le cache de pages SQLite chaud.
+# Une connexion n'a qu'un utilisateur à la fois : chaque DatabaseSchema connecté
+# la détient seul (sa transaction n'est jamais partagée avec une autre session
+# ou un autre thread) et la rend au pool à disconnect().
+_CONNEXIONS_LIBRES = {}  # clé -> [connexions inactives]
+_CONNEXIONS_LOCK = threading.Lock()
+_MAX_CONNEXIONS_LIBRES = 4  # par base ; au-delà, les connexions rendues sont fermées
+
+
+def _cle_connexion(db_path: str) -> Optional[str]:
+    """Clé du pool pour un chemin, None si la base ne doit pas être partagée"""
+    if db_path == ":memory:" or db_path.startswith("file:"):
+        return None
+    return os.path.abspath(db_path)
+
+
+def _ouvrir_connexion(db_path: str) -> sqlite3.Connection:
+    """Ouvre et configure une nouvelle connexion"""
+    # check_same_thread=False pour Streamlit : une exécution du script (et ses
+    # callbacks) peut changer de thread, la connexion restant à un seul utilisateur
+    # cached_statements : cache de requêtes préparées plus large que le défaut (128)
+    conn = sqlite3.connect(db_path, check_same_thread=False, cached_statements=256)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(_PRAGMAS_CONNEXION)
+    return conn
+
+
+def _fermer_connexions_libres(db_path: str):
+    """Ferme les connexions inactives d'un chemin (celles en cours d'utilisation restent ouvertes)"""
+    cle = _cle_connexion(db_path)
+    with _CONNEXIONS_LOCK:
+        libres = _CONNEXIONS_LIBRES.pop(cle, [])
+    for conn in libres:
+        conn.close()
 
 
 class DatabaseSchema:
@@ -25,133 +183,63 @@ class DatabaseSchema:
         self.conn = None
     
     def connect(self):
-        # AJOUTEZ check_same_thread=False
-        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
-        self.conn.execute("PRAGMA foreign_keys = ON")
-        # AJOUTEZ ces optimisations
-        self.conn.execute("PRAGMA journal_mode = WAL")
-        self.conn.execute("PRAGMA synchronous = NORMAL")
+        """Établit la connexion à la base de données (reprise du pool si une connexion y est libre)"""
+        if self.conn:
+            return self.conn
+        
+        cle = _cle_connexion(self.db_path)
+        if cle is not None:
+            with _CONNEXIONS_LOCK:
+                libres = _CONNEXIONS_LIBRES.get(cle)
+                if libres:
+                    self.conn = libres.pop()
+        
+        if self.conn is None:
+            self.conn = _ouvrir_connexion(self.db_path)
         return self.conn
-
-    #def connect(self):
-    #    """Établit la connexion à la base de données"""
-        # check_same_thread=False pour Streamlit (multi-thread)
-    #    self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
-    #    self.conn.row_factory = sqlite3.Row  # Permet d'accéder aux colonnes par nom
-        # Active les clés étrangères (désactivées par défaut dans SQLite)
-    #    self.conn.execute("PRAGMA foreign_keys = ON")
-        # Optimisations pour Streamlit
-    #    self.conn.execute("PRAGMA journal_mode = WAL")  # Write-Ahead Logging
-    #    self.conn.execute("PRAGMA synchronous = NORMAL")
-    #    return self.conn
+    
+    def optimize(self):
+        """Met à jour les statistiques du planificateur si nécessaire (PRAGMA optimize)"""
+        try:
+            self.conn.execute("PRAGMA analysis_limit = 400")
+            self.conn.execute("PRAGMA optimize")
+        except sqlite3.Error:
+            # Purement opportuniste : ne doit jamais empêcher la fermeture
+            pass
     
     def disconnect(self):
-        """Ferme la connexion à la base de données"""
-        if self.conn:
-            self.conn.close()
-            self.conn = None
+        """Rend la connexion au pool (ou la ferme si le pool est plein) ; une transaction non validée est annulée"""
+        if not self.conn:
+            return
+        
+        self.optimize()
+        conn, self.conn = self.conn, None
+        
+        cle = _cle_connexion(self.db_path)
+        if cle is not None:
+            try:
+                # Même état qu'une connexion neuve pour le prochain utilisateur
+                if conn.in_transaction:
+                    conn.rollback()
+                conn.row_factory = sqlite3.Row
+                with _CONNEXIONS_LOCK:
+                    libres = _CONNEXIONS_LIBRES.setdefault(cle, [])
+                    if len(libres) < _MAX_CONNEXIONS_LIBRES:
+                        libres.append(conn)
+                        return
+            except sqlite3.Error:
+                # Connexion inutilisable (base supprimée...) : fermée plutôt que rendue
+                pass
+        
+        conn.close()
     
     def create_tables(self):
         """
         Crée toutes les tables de la base de données
         """
-        cursor = self.conn.cursor()
-        
-        # Table 1 : PROGRAMMES
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS programmes (
-                id TEXT PRIMARY KEY,
-                titre TEXT NOT NULL,
-                sujet TEXT NOT NULL,
-                duree_jours INTEGER,
-                niveau TEXT,
-                temps_quotidien INTEGER,
-                description TEXT,
-                date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                actif INTEGER DEFAULT 1
-            )
-        """)
-        
-        # Table 2 : SEMAINES
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS semaines (
-                id TEXT PRIMARY KEY,
-                programme_id TEXT NOT NULL,
-                numero INTEGER NOT NULL,
-                titre TEXT NOT NULL,
-                objectif TEXT,
-                temps_quotidien TEXT,
-                ordre INTEGER,
-                FOREIGN KEY (programme_id) REFERENCES programmes(id) ON DELETE CASCADE
-            )
-        """)
-        
-        # Table 3 : JOURS
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS jours (
-                id TEXT PRIMARY KEY,
-                semaine_id TEXT NOT NULL,
-                nom TEXT NOT NULL,
-                type TEXT DEFAULT 'normal',
-                ordre INTEGER,
-                FOREIGN KEY (semaine_id) REFERENCES semaines(id) ON DELETE CASCADE
-            )
-        """)
-        
-        # Table 4 : CONTENUS
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS contenus (
-                id TEXT PRIMARY KEY,
-                jour_id TEXT NOT NULL,
-                type TEXT NOT NULL,
-                titre TEXT NOT NULL,
-                description TEXT,
-                enonce TEXT,
-                indice TEXT,
-                difficulte INTEGER,
-                temps_estime INTEGER,
-                ordre INTEGER,
-                FOREIGN KEY (jour_id) REFERENCES jours(id) ON DELETE CASCADE
-            )
-        """)
-        
-        # Table 5 : PREREQUIS (relation many-to-many)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS prerequis (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                contenu_id TEXT NOT NULL,
-                prerequis_contenu_id TEXT NOT NULL,
-                obligatoire INTEGER DEFAULT 1,
-                FOREIGN KEY (contenu_id) REFERENCES contenus(id) ON DELETE CASCADE,
-                FOREIGN KEY (prerequis_contenu_id) REFERENCES contenus(id) ON DELETE CASCADE,
-                UNIQUE(contenu_id, prerequis_contenu_id)
-            )
-        """)
-        
-        # Table 6 : PROGRESSION
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS progression (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                contenu_id TEXT NOT NULL,
-                statut TEXT DEFAULT 'non_commence',
-                date_debut TIMESTAMP,
-                date_completion TIMESTAMP,
-                notes TEXT,
-                temps_passe INTEGER DEFAULT 0,
-                FOREIGN KEY (contenu_id) REFERENCES contenus(id) ON DELETE CASCADE,
-                UNIQUE(contenu_id)
-            )
-        """)
-        
-        # Index pour optimiser les requêtes fréquentes
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_semaines_programme ON semaines(programme_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_jours_semaine ON jours(semaine_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_contenus_jour ON contenus(jour_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_prerequis_contenu ON prerequis(contenu_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_progression_contenu ON progression(contenu_id)")
-        
-        self.conn.commit()
+        # Tout le DDL en un seul script (une seule transaction)
+        self.conn.executescript(_SCHEMA_SQL)
+        self.optimize()
         print("✅ Tables créées avec succès")
     
     def drop_all_tables(self):
@@ -205,15 +293,17 @@ class DatabaseSchema:
         """
         cursor = self.conn.cursor()
         
-        stats = {}
-        tables = ['programmes', 'semaines', 'jours', 'contenus', 'prerequis', 'progression']
-        
-        for table in tables:
-            cursor.execute(f"SELECT COUNT(*) FROM {table}")
-            count = cursor.fetchone()[0]
-            stats[table] = count
+        # Tous les comptages en une seule requête
+        cursor.execute("""
+            SELECT 'programmes', (SELECT COUNT(*) FROM programmes)
+            UNION ALL SELECT 'semaines', (SELECT COUNT(*) FROM semaines)
+            UNION ALL SELECT 'jours', (SELECT COUNT(*) FROM jours)
+            UNION ALL SELECT 'contenus', (SELECT COUNT(*) FROM contenus)
+            UNION ALL SELECT 'prerequis', (SELECT COUNT(*) FROM prerequis)
+            UNION ALL SELECT 'progression', (SELECT COUNT(*) FROM progression)
+        """)
         
-        return stats
+        return dict(cursor.fetchall())
     
     def export_schema_info(self) -> str:
         """
@@ -224,29 +314,35 @@ class DatabaseSchema:
         """
         cursor = self.conn.cursor()
         
-        info = []
-        info.append("="*70)
-        info.append("SCHÉMA DE BASE DE DONNÉES")
-        info.append("="*70)
-        
         tables = ['programmes', 'semaines', 'jours', 'contenus', 'prerequis', 'progression']
         
-        for table in tables:
-            cursor.execute(f"PRAGMA table_info({table})")
-            columns = cursor.fetchall()
+        # Toutes les colonnes en une requête (pragma_table_info), dans l'ordre des tables
+        valeurs = ", ".join(f"({pos}, ?)" for pos in range(len(tables)))
+        cursor.execute(f"""
+            WITH t(pos, nom) AS (VALUES {valeurs})
+            SELECT t.nom, p.name, p.type, p."notnull", p.pk
+            FROM t LEFT JOIN pragma_table_info(t.nom) p
+            ORDER BY t.pos, p.cid
+        """, tables)
+        
+        def lignes():
+            yield "="*70
+            yield "SCHÉMA DE BASE DE DONNÉES"
+            yield "="*70
             
-            info.append(f"\n📋 Table: {table.upper()}")
-            info.append("-" * 70)
-            for col in columns:
-                col_name = col[1]
-                col_type = col[2]
-                not_null = "NOT NULL" if col[3] else ""
-                primary_key = "PRIMARY KEY" if col[5] else ""
-                info.append(f"  • {col_name:25} {col_type:15} {not_null:10} {primary_key}")
-        
-        info.append("\n" + "="*70)
+            for table, columns in groupby(cursor, key=itemgetter(0)):
+                yield f"\n📋 Table: {table.upper()}"
+                yield "-" * 70
+                for _, col_name, col_type, not_null, pk in columns:
+                    if col_name is None:
+                        continue
+                    not_null = "NOT NULL" if not_null else ""
+                    primary_key = "PRIMARY KEY" if pk else ""
+                    yield f"  • {col_name:25} {col_type:15} {not_null:10} {primary_key}"
+            
+            yield "\n" + "="*70
         
-        return "\n".join(info)
+        return "\n".join(lignes())
 
 
 class DatabaseInitializer:
@@ -268,6 +364,8 @@ class DatabaseInitializer:
             Instance de DatabaseSchema connectée
         """
         if force and os.path.exists(db_path):
+            # Les connexions du pool pointeraient encore sur l'ancien fichier
+            _fermer_connexions_libres(db_path)
             os.remove(db_path)
             print(f"🗑️  Base de données existante supprimée: {db_path}")
         
@@ -291,8 +389,6 @@ class DatabaseInitializer:
             source_db: Chemin de la DB source
             backup_path: Chemin de sauvegarde (auto-généré si None)
         """
-        import shutil
-        
         if not os.path.exists(source_db):
             print(f"❌ Base de données source introuvable: {source_db}")
             return
@@ -301,7 +397,16 @@ class DatabaseInitializer:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             backup_path = f"{source_db}.backup_{timestamp}"
         
-        shutil.copy2(source_db, backup_path)
+        # API de sauvegarde en ligne : copie cohérente même en WAL ou DB ouverte
+        src = sqlite3.connect(source_db)
+        dst = sqlite3.connect(backup_path)
+        try:
+            with dst:
+                src.backup(dst, pages=1024)
+        finally:
+            dst.close()
+            src.close()
+        
         print(f"💾 Sauvegarde créée: {backup_path}")
 
 
@@ -309,6 +414,12 @@ class DatabaseInitializer:
 # FONCTIONS UTILITAIRES
 # ============================================================================
 
+@lru_cache(maxsize=4096, typed=True)
+def _clean_part(part) -> str:
+    """Normalise une partie d'ID (mémorisé : les mêmes parties reviennent sans cesse)"""
+    return str(part).lower().replace(" ", "_")
+
+
 def generate_id(prefix: str, *parts) -> str:
     """
     Génère un ID lisible pour les entités
@@ -326,8 +437,7 @@ def generate_id(prefix: str, *parts) -> str:
         >>> generate_id("sem", "1", "prog_python_30j")
         'sem_1_prog_python_30j'
     """
-    parts_clean = [str(p).lower().replace(" ", "_") for p in parts]
-    return f"{prefix}_{'_'.join(parts_clean)}"
+    return f"{prefix}_" + "_".join(map(_clean_part, parts))
 
 
 def format_duration(minutes: int) -> str:
@@ -346,6 +456,15 @@ def format_duration(minutes: int) -> str:
         >>> format_duration(150)
         '2h30'
     """
+    # Cas courant (0 à 8h) : chaîne précalculée
+    if type(minutes) is int and 0 <= minutes < _NB_DURATIONS_PRECALCULEES:
+        return _FMT_DURATION_CACHE[minutes]
+    
+    return _format_duration_calcule(minutes)
+
+
+def _format_duration_calcule(minutes: int) -> str:
+    """Mise en forme effective utilisée par format_duration hors de la table"""
     if minutes < 60:
         return f"{minutes}min"
     
@@ -358,6 +477,15 @@ def format_duration(minutes: int) -> str:
     return f"{hours}h{mins:02d}"
 
 
+# Durées de 0 à 480 minutes formatées une fois pour toutes au chargement
+_NB_DURATIONS_PRECALCULEES = 481
+_FMT_DURATION_CACHE = [_format_duration_calcule(m) for m in range(_NB_DURATIONS_PRECALCULEES)]
+
+
+# "2h", "2h30", "2h30min", "30min" (insensible à la casse, espaces tolérés)
+_DURATION_RE = re.compile(r'^\s*(?:(\d+)\s*h\s*(\d*)\s*(?:min)?|(\d+)\s*min)\s*$', re.IGNORECASE)
+
+
 def parse_duration(duration_str: str) -> int:
     """
     Parse une chaîne de durée vers des minutes
@@ -376,28 +504,86 @@ def parse_duration(duration_str: str) -> int:
         >>> parse_duration("2h30")
         150
     """
-    duration_str = duration_str.lower().strip()
+    match = _DURATION_RE.match(duration_str)
     
-    total_minutes = 0
+    if match is None:
+        # Format non reconnu : erreur s'il contient une unité, 0 sinon
+        lowered = duration_str.lower()
+        if 'h' in lowered or 'min' in lowered:
+            raise ValueError(f"Durée invalide: {duration_str!r}")
+        return 0
     
-    # Heures
-    if 'h' in duration_str:
-        parts = duration_str.split('h')
-        hours = int(parts[0])
-        total_minutes += hours * 60
-        
-        # Minutes après 'h'
-        if len(parts) > 1 and parts[1]:
-            mins_part = parts[1].replace('min', '').strip()
-            if mins_part:
-                total_minutes += int(mins_part)
+    hours, mins_after_hours, mins_only = match.groups()
+    
+    if hours is not None:
+        return int(hours) * 60 + (int(mins_after_hours) if mins_after_hours else 0)
     
-    # Minutes seules
-    elif 'min' in duration_str:
-        minutes = int(duration_str.replace('min', '').strip())
-        total_minutes = minutes
+    return int(mins_only)
+
+
+def drop_secondary_indexes(conn: sqlite3.Connection, table: str) -> list:
+    """
+    Supprime les index explicites d'une table avant une insertion massive
+    
+    Les index automatiques (clé primaire, UNIQUE) sont conservés. À appeler
+    dans la transaction d'import : un rollback les rétablit aussi.
     
-    return total_minutes
+    Args:
+        conn: Connexion SQLite
+        table: Nom de la table
+    
+    Returns:
+        Liste des CREATE INDEX à rejouer avec restore_indexes()
+    """
+    index = conn.execute("""
+        SELECT name, sql FROM sqlite_master
+        WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL
+    """, (table,)).fetchall()
+    
+    for nom, _ in index:
+        conn.execute(f'DROP INDEX IF EXISTS "{nom}"')
+    
+    return [sql for _, sql in index]
+
+
+def restore_indexes(conn: sqlite3.Connection, index_sql: list):
+    """Recrée en une construction triée les index supprimés par drop_secondary_indexes()"""
+    for sql in index_sql:
+        conn.execute(sql)
+
+
+def apply_bulk_pragmas(conn: sqlite3.Connection) -> dict:
+    """
+    Règle une connexion pour une écriture massive
+    
+    execute et non executescript, qui validerait une transaction en cours.
+    Un PRAGMA refusé (base en lecture seule, transaction ouverte) est ignoré.
+    
+    Args:
+        conn: Connexion SQLite
+    
+    Returns:
+        Valeurs d'origine des PRAGMAs modifiés, à rétablir avec restore_pragmas()
+    """
+    origine = {}
+    
+    for nom, valeur in _PRAGMAS_ECRITURE_MASSIVE.items():
+        try:
+            origine[nom] = conn.execute(f"PRAGMA {nom}").fetchone()[0]
+            conn.execute(f"PRAGMA {nom} = {valeur}")
+        except sqlite3.Error:
+            pass
+    
+    return origine
+
+
+def restore_pragmas(conn: sqlite3.Connection, origine: dict):
+    """Rétablit les PRAGMAs sauvegardés par apply_bulk_pragmas()"""
+    for nom, valeur in origine.items():
+        try:
+            conn.execute(f"PRAGMA {nom} = {valeur}")
+        except sqlite3.Error:
+            pass
 
 
 # ============================================================================
@@ -412,8 +598,8 @@ def main():
     print("TEST DU SCHÉMA DE BASE DE DONNÉES")
     print("="*70 + "\n")
     
-    # Initialiser une nouvelle DB de test
-    db = DatabaseInitializer.initialize_new_database("test_learning.db", force=True)
+    # Initialiser une nouvelle DB de test, entièrement en mémoire (aucun accès disque)
+    db = DatabaseInitializer.initialize_new_database(":memory:", force=True)
     
     # Afficher les informations du schéma
     print("\n" + db.export_schema_info())
@@ -444,17 +630,18 @@ def main():
     print(f"  • '30min' = {parse_duration('30min')} minutes")
     print(f"  • '2h30' = {parse_duration('2h30')} minutes")
     
-    # Créer une sauvegarde
+    # Tester l'API de sauvegarde vers une autre base en mémoire
     print("\n💾 TEST DE SAUVEGARDE:")
-    DatabaseInitializer.create_backup("test_learning.db")
+    copie = sqlite3.connect(":memory:")
+    db.conn.backup(copie)
+    nb_tables = copie.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table'").fetchone()[0]
+    copie.close()
+    print(f"  • Copie en mémoire: {nb_tables} tables")
     
     # Nettoyer
     db.disconnect()
     print("\n✅ Tests terminés avec succès!")
-    print("\nℹ️  Fichiers créés:")
-    print("  • test_learning.db (base de données de test)")
-    print("  • test_learning.db.backup_* (sauvegarde)")
-    print("\nVous pouvez les supprimer si nécessaire.")
+    print("\nℹ️  Aucun fichier créé (base de test en mémoire)")
 
 
 if __name__ == "__main__":
@@ -5,17 +5,111 @@
 # Compatible avec DatabaseSchema et connexions SQLite
 # ============================================================
 
+import io
 import json
+import os
 import sqlite3
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
+from pathlib import Path
 import streamlit as st
+from database_schema import (
+    DatabaseSchema, drop_secondary_indexes, restore_indexes, apply_bulk_pragmas, restore_pragmas
+)
+
+# Encodeur/décodeur JSON en C, utilisé s'il est installé
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 # ============================================================
 # FONCTION D'EXPORT DE PROGRESSION - VERSION ADAPTÉE
 # ============================================================
 
-def exporter_progression(db, prog_id):
+def _serialiser_json(data, out=None, as_bytes=False):
+    """
+    Sérialise un export JSON
+    
+    Args:
+        data: Données à sérialiser
+        out: Flux optionnel (fichier, réponse...), texte ou binaire ; si fourni,
+            le JSON y est écrit directement, sans indentation
+        as_bytes: Sans flux, retourne le JSON indenté en octets UTF-8 plutôt qu'en str
+    
+    Returns:
+        str (bytes si as_bytes) : JSON indenté si out est None, sinon None
+    """
+    if out is None:
+        if orjson is not None:
+            try:
+                # orjson produit déjà de l'UTF-8 : aucun décodage si des octets sont demandés
+                donnees = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+                return donnees if as_bytes else donnees.decode()
+            except TypeError:
+                # Type non géré par orjson (ex. entier > 64 bits) : encodeur standard
+                pass
+        texte = json.dumps(data, indent=2, ensure_ascii=False)
+        return texte.encode() if as_bytes else texte
+    
+    binaire = isinstance(out, (io.RawIOBase, io.BufferedIOBase))
+    
+    if orjson is not None:
+        try:
+            # Octets UTF-8 produits en une passe C ; écrits tels quels sur un flux binaire
+            donnees = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            donnees = None
+        if donnees is not None:
+            out.write(donnees if binaire else donnees.decode())
+            return None
+    
+    if binaire:
+        out.write(json.dumps(data, ensure_ascii=False).encode())
+    else:
+        json.dump(data, out, ensure_ascii=False)
+    return None
+
+
+# Type de base déjà détecté, par chemin de fichier (True = base learning).
+# Les objets sqlite3.Connection n'acceptent ni attribut ni référence faible :
+# seules les bases identifiées par leur chemin sont mémorisées.
+_TYPE_BASE_CACHE = {}
+
+
+def _est_base_learning(conn, db_path=None):
+    """Indique si la base contient la table 'programmes' (learning) plutôt que 'programme'"""
+    cle = os.path.abspath(db_path) if db_path and db_path != ":memory:" else None
+    
+    est_learning = _TYPE_BASE_CACHE.get(cle)
+    if est_learning is None:
+        est_learning = conn.execute("""
+            SELECT 1 FROM sqlite_master
+            WHERE type = 'table' AND name = 'programmes'
+            LIMIT 1
+        """).fetchone() is not None
+        if cle is not None:
+            _TYPE_BASE_CACHE[cle] = est_learning
+    
+    return est_learning
+
+
+def _connexion_lecture_seule(db_path):
+    """
+    Connexion en lecture seule (mode=ro) sur une base désignée par son chemin
+    
+    Un export ne modifie pas la base lue : ni index créé, ni passage en WAL
+    comme le ferait une connexion de DatabaseSchema.
+    """
+    return sqlite3.connect(Path(db_path).resolve().as_uri() + "?mode=ro", uri=True)
+
+
+def exporter_progression(db, prog_id, out=None, as_bytes=False):
     """
     Exporte la progression complète d'un programme au format JSON
     VERSION ADAPTÉE pour DatabaseSchema et SQLite standard
@@ -23,24 +117,39 @@ def exporter_progression(db, prog_id):
     Args:
         db: Objet DatabaseSchema ou connexion SQLite ou chemin string
         prog_id: ID du programme à exporter (string ou int)
+        out: Flux optionnel où écrire le JSON directement
+        as_bytes: Retourne le JSON formaté en octets UTF-8 (prêts à télécharger)
+    
+    Returns:
+        str: Données JSON formatées (bytes si as_bytes, None si out est un flux)
+    """
+    return _serialiser_json(_donnees_progression(db, prog_id), out, as_bytes)
+
+
+def _donnees_progression(db, prog_id):
+    """
+    Document d'export d'un programme, avant sérialisation
     
     Returns:
-        str: Données JSON formatées
+        dict: Document exporté, ou {"erreur": ...} en cas d'échec
     """
     
     # ========================================
     # DÉTECTION DU TYPE DE DB
     # ========================================
     
+    # Connexion en lecture seule ouverte pour un chemin string, fermée en sortie
+    connexion_ro = None
+    
     # Cas 1: C'est un objet DatabaseSchema (votre app learning)
     if hasattr(db, 'conn'):
         conn = db.conn
         should_close = False
         table_prefix = "programmes"  # Tables au pluriel
-    # Cas 2: C'est un chemin string
+    # Cas 2: C'est un chemin string (base externe, ouverte dans le try)
     elif isinstance(db, str):
-        conn = sqlite3.connect(db)
-        should_close = True
+        conn = None
+        should_close = False
         table_prefix = "programme"  # Tables au singulier (app musculation)
     # Cas 3: C'est déjà une connexion SQLite
     else:
@@ -49,56 +158,65 @@ def exporter_progression(db, prog_id):
         table_prefix = "programme"  # Par défaut singulier
     
     try:
-        cursor = conn.cursor()
+        if conn is None:
+            # Fichier absent ou illisible : document d'erreur comme pour les autres échecs
+            conn = connexion_ro = _connexion_lecture_seule(db)
         
         # ========================================
         # DÉTECTION DU TYPE DE BASE DE DONNÉES
         # ========================================
         
-        # Vérifier quelle table existe
-        cursor.execute("""
-            SELECT name FROM sqlite_master 
-            WHERE type='table' AND (name='programmes' OR name='programme')
-        """)
-        tables = cursor.fetchall()
-        
         # Déterminer si c'est une base "learning" ou "musculation"
-        is_learning_db = any(t[0] == 'programmes' for t in tables)
+        # (mémorisé par chemin : une seule lecture de sqlite_master par base)
+        db_path = getattr(db, 'db_path', db if isinstance(db, str) else None)
+        is_learning_db = _est_base_learning(conn, db_path)
         
         if is_learning_db:
             # ========================================
             # BASE DE DONNÉES LEARNING
             # ========================================
-            return exporter_progression_learning(conn, prog_id, should_close)
+            return _donnees_progression_learning(conn, prog_id, should_close)
         else:
             # ========================================
             # BASE DE DONNÉES MUSCULATION
             # ========================================
-            return exporter_progression_musculation(conn, prog_id, should_close)
+            if connexion_ro is None:
+                # Connexion fournie par l'appelant : index assurés dans sa base
+                _assurer_index_musculation(conn, db_path)
+            return _donnees_progression_musculation(conn, prog_id, should_close)
     
     except Exception as e:
-        if should_close:
-            conn.close()
-        return json.dumps({
+        return {
             "erreur": "Erreur lors de l'export",
             "details": str(e),
             "type": type(e).__name__
-        }, indent=2, ensure_ascii=False)
+        }
+    
+    finally:
+        if connexion_ro is not None:
+            connexion_ro.close()
 
 
 # ============================================================
 # EXPORT POUR BASE LEARNING (programmes/semaines/jours/contenus)
 # ============================================================
 
-def exporter_progression_learning(conn, prog_id, should_close):
+def exporter_progression_learning(conn, prog_id, should_close, out=None, as_bytes=False):
     """Export pour une base de type learning_programme.db"""
+    return _serialiser_json(_donnees_progression_learning(conn, prog_id, should_close), out, as_bytes)
+
+
+def _donnees_progression_learning(conn, prog_id, should_close):
+    """Document d'export learning, avant sérialisation"""
     
     try:
         cursor = conn.cursor()
+        # Tuples simples (dépaquetage direct) même si la connexion utilise sqlite3.Row
+        cursor.row_factory = None
         
         # Récupération du programme
         cursor.execute("""
-            SELECT nom, description, duree_jours
+            SELECT titre, description, duree_jours
             FROM programmes 
             WHERE id = ?
         """, (prog_id,))
@@ -106,11 +224,11 @@ def exporter_progression_learning(conn, prog_id, should_close):
         prog_data = cursor.fetchone()
         
         if not prog_data:
-            return json.dumps({
+            return {
                 "erreur": "Programme non trouvé",
                 "prog_id": prog_id,
                 "timestamp": datetime.now().isoformat()
-            }, indent=2, ensure_ascii=False)
+            }
         
         # Structure principale
         export_data = {
@@ -137,123 +255,108 @@ def exporter_progression_learning(conn, prog_id, should_close):
             "semaines": []
         }
         
-        # Récupération des semaines
+        stats = export_data["statistiques"]
+        
+        # Toute la structure, progression comprise, en une seule requête ordonnée
+        # (au lieu de 1 + S + S·J + C requêtes). Les LEFT JOIN conservent semaines et
+        # jours vides ; progression a au plus une ligne par contenu (clé contenu_id).
+        # Le rowid départage les ordres égaux comme le ferait le parcours des index.
         cursor.execute("""
-            SELECT id, numero, titre, objectif, temps_quotidien, ordre
-            FROM semaines 
-            WHERE programme_id = ? 
-            ORDER BY ordre
+            SELECT s.id, s.numero, s.titre, s.objectif, s.temps_quotidien, s.ordre,
+                   j.id, j.nom, j.type, j.ordre,
+                   c.id, c.titre, c.type, c.description, c.enonce,
+                   c.indice, c.difficulte, c.temps_estime, c.ordre,
+                   p.contenu_id, p.statut, p.date_debut, p.date_completion, p.temps_passe, p.notes
+            FROM semaines s
+            LEFT JOIN jours j ON j.semaine_id = s.id
+            LEFT JOIN contenus c ON c.jour_id = j.id
+            LEFT JOIN progression p ON p.contenu_id = c.id
+            WHERE s.programme_id = ?
+            ORDER BY s.ordre, s.rowid, j.ordre, j.rowid, c.ordre, c.rowid
         """, (prog_id,))
         
-        semaines = cursor.fetchall()
-        export_data["statistiques"]["nombre_semaines"] = len(semaines)
+        semaine_data = None
+        jour_data = None
         
-        # Traitement de chaque semaine
-        for semaine in semaines:
-            semaine_id = semaine[0]
-            
-            semaine_data = {
-                "id": semaine_id,
-                "numero": semaine[1],
-                "titre": semaine[2],
-                "objectif": semaine[3],
-                "temps_quotidien": semaine[4],
-                "ordre": semaine[5],
-                "jours": []
-            }
-            
-            # Récupération des jours
-            cursor.execute("""
-                SELECT id, numero, nom, type, ordre
-                FROM jours 
-                WHERE semaine_id = ?
-                ORDER BY ordre
-            """, (semaine_id,))
+        for (s_id, s_num, s_titre, s_objectif, s_temps, s_ordre,
+             j_id, j_nom, j_type, j_ordre,
+             c_id, c_titre, c_type, c_description, c_enonce,
+             c_indice, c_difficulte, c_temps, c_ordre,
+             p_id, p_statut, p_debut, p_fin, p_temps, p_notes) in cursor:
+            # Nouvelle semaine
+            if semaine_data is None or semaine_data["id"] != s_id:
+                semaine_data = {
+                    "id": s_id,
+                    "numero": s_num,
+                    "titre": s_titre,
+                    "objectif": s_objectif,
+                    "temps_quotidien": s_temps,
+                    "ordre": s_ordre,
+                    "jours": []
+                }
+                export_data["semaines"].append(semaine_data)
+                stats["nombre_semaines"] += 1
+                jour_data = None
             
-            jours = cursor.fetchall()
-            export_data["statistiques"]["nombre_jours"] += len(jours)
+            if j_id is None:
+                continue
             
-            # Traitement de chaque jour
-            for jour in jours:
-                jour_id = jour[0]
-                
+            # Nouveau jour
+            if jour_data is None or jour_data["id"] != j_id:
                 jour_data = {
-                    "id": jour_id,
-                    "numero": jour[1],
-                    "nom": jour[2],
-                    "type": jour[3],
-                    "ordre": jour[4],
+                    "id": j_id,
+                    "nom": j_nom,
+                    "type": j_type,
+                    "ordre": j_ordre,
                     "contenus": []
                 }
+                semaine_data["jours"].append(jour_data)
+                stats["nombre_jours"] += 1
+            
+            if c_id is None:
+                continue
+            
+            stats["nombre_contenus"] += 1
+            
+            contenu_data = {
+                "id": c_id,
+                "titre": c_titre,
+                "type": c_type,
+                "description": c_description,
+                "enonce": c_enonce,
+                "indice": c_indice,
+                "difficulte": c_difficulte,
+                "temps_estime": c_temps,
+                "ordre": c_ordre,
+                "progression": None
+            }
+            
+            # Progression issue du LEFT JOIN (absente si p.contenu_id est NULL)
+            if p_id is not None:
+                contenu_data["progression"] = {
+                    "statut": p_statut,
+                    "date_debut": p_debut,
+                    "date_fin": p_fin,
+                    "temps_passe": p_temps,
+                    "notes": p_notes
+                }
                 
-                # Récupération des contenus
-                cursor.execute("""
-                    SELECT 
-                        id, titre, type, description, enonce,
-                        indice, difficulte, temps_estime, ordre
-                    FROM contenus 
-                    WHERE jour_id = ?
-                    ORDER BY ordre
-                """, (jour_id,))
-                
-                contenus = cursor.fetchall()
-                export_data["statistiques"]["nombre_contenus"] += len(contenus)
+                if p_statut == 'termine':
+                    stats["contenus_termines"] += 1
                 
-                # Traitement de chaque contenu
-                for contenu in contenus:
-                    contenu_id = contenu[0]
-                    
-                    contenu_data = {
-                        "id": contenu_id,
-                        "titre": contenu[1],
-                        "type": contenu[2],
-                        "description": contenu[3],
-                        "enonce": contenu[4],
-                        "indice": contenu[5],
-                        "difficulte": contenu[6],
-                        "temps_estime": contenu[7],
-                        "ordre": contenu[8],
-                        "progression": None
-                    }
-                    
-                    # Récupération de la progression
-                    cursor.execute("""
-                        SELECT statut, date_debut, date_fin, temps_passe, notes
-                        FROM progression 
-                        WHERE contenu_id = ?
-                    """, (contenu_id,))
-                    
-                    progression = cursor.fetchone()
-                    
-                    if progression:
-                        contenu_data["progression"] = {
-                            "statut": progression[0],
-                            "date_debut": progression[1],
-                            "date_fin": progression[2],
-                            "temps_passe": progression[3],
-                            "notes": progression[4]
-                        }
-                        
-                        if progression[0] == 'termine':
-                            export_data["statistiques"]["contenus_termines"] += 1
-                        
-                        if progression[3]:
-                            export_data["statistiques"]["temps_total_passe"] += progression[3]
-                    
-                    jour_data["contenus"].append(contenu_data)
-                
-                semaine_data["jours"].append(jour_data)
+                if p_temps:
+                    stats["temps_total_passe"] += p_temps
             
-            export_data["semaines"].append(semaine_data)
+            jour_data["contenus"].append(contenu_data)
         
-        return json.dumps(export_data, indent=2, ensure_ascii=False)
+        return export_data
     
     except Exception as e:
-        return json.dumps({
+        return {
             "erreur": "Erreur lors de l'export learning",
             "details": str(e),
             "type": type(e).__name__
-        }, indent=2, ensure_ascii=False)
+        }
     
     finally:
         if should_close:
@@ -264,11 +367,195 @@ def exporter_progression_learning(conn, prog_id, should_close):
 # EXPORT POUR BASE MUSCULATION (programme/seance/exercice/serie)
 # ============================================================
 
-def exporter_progression_musculation(conn, prog_id, should_close):
+# Index (parent, ordre) parcourus par l'export musculation, créés au premier
+# export d'une base (les bases musculation ne viennent pas de DatabaseSchema)
+_INDEX_MUSCULATION = (
+    "CREATE INDEX IF NOT EXISTS idx_seance_programme_date ON seance(programme_id, date)",
+    "CREATE INDEX IF NOT EXISTS idx_seance_exercice_seance_ordre ON seance_exercice(seance_id, ordre)",
+    "CREATE INDEX IF NOT EXISTS idx_serie_seance_exercice_numero ON serie(seance_exercice_id, numero_serie)",
+)
+
+# Chemins des bases dont les index ont déjà été assurés dans ce processus
+_INDEX_MUSCULATION_ASSURES = set()
+
+
+def _assurer_index_musculation(conn, db_path=None):
+    """Crée les index de l'export musculation une fois par base (par chemin si connu)"""
+    cle = os.path.abspath(db_path) if db_path and db_path != ":memory:" else None
+    if cle is not None and cle in _INDEX_MUSCULATION_ASSURES:
+        return
+    
+    try:
+        for sql in _INDEX_MUSCULATION:
+            conn.execute(sql)
+    except sqlite3.Error:
+        # Base en lecture seule ou schéma différent : export sans ces index
+        return
+    
+    if cle is not None:
+        _INDEX_MUSCULATION_ASSURES.add(cle)
+
+
+# Fonctions JSON intégrées au cœur de SQLite depuis 3.38
+_JSON_SQL_DISPONIBLE = sqlite3.sqlite_version_info >= (3, 38, 0)
+
+# Séances d'un programme sous forme d'un seul tableau JSON. Chaque niveau est
+# agrégé depuis une sous-requête triée (l'ordre d'agrégation suit celui des lignes) ;
+# json() conserve les tableaux imbriqués comme JSON et non comme chaînes.
+_SQL_SEANCES_JSON = """
+    SELECT json_group_array(json_object(
+        'id', id,
+        'nom', nom,
+        'date', date,
+        'duree_minutes', duree_min,
+        'statut', statut,
+        'commentaire', commentaire,
+        'nombre_exercices', json_array_length(exercices),
+        'exercices', json(exercices)
+    ))
+    FROM (
+        SELECT s.id, s.nom, s.date, s.commentaire, s.duree_min, s.statut,
+            (SELECT json_group_array(json_object(
+                        'id', id,
+                        'nom', nom,
+                        'ordre', ordre,
+                        'notes', notes,
+                        'nombre_series', json_array_length(series),
+                        'series', json(series)
+                    ))
+             FROM (
+                SELECT e.id, e.nom, se.ordre, se.notes,
+                    (SELECT json_group_array(json_object(
+                                'numero', numero_serie,
+                                'poids_kg', poids_kg,
+                                'repetitions', repetitions,
+                                'duree_sec', duree_sec,
+                                'distance_m', distance_m,
+                                'rpe', rpe,
+                                'notes', notes
+                            ))
+                     FROM (
+                        SELECT numero_serie, poids_kg, repetitions, duree_sec,
+                               distance_m, rpe, notes
+                        FROM serie
+                        WHERE seance_exercice_id = se.id
+                        ORDER BY numero_serie, rowid
+                     )) AS series
+                FROM seance_exercice se
+                JOIN exercice e ON se.exercice_id = e.id
+                WHERE se.seance_id = s.id
+                ORDER BY se.ordre, se.rowid
+             )) AS exercices
+        FROM seance s
+        WHERE s.programme_id = ?
+        ORDER BY s.date, s.rowid
+    )
+"""
+
+
+def _seances_musculation_sql(cursor, prog_id):
+    """Séances construites par SQLite (une requête), décodées en une passe C"""
+    cursor.execute(_SQL_SEANCES_JSON, (prog_id,))
+    return _charger_json(cursor.fetchone()[0])
+
+
+def _seances_musculation_python(cursor, prog_id):
+    """
+    Séances construites en Python (SQLite sans fonctions JSON)
+    
+    Trois requêtes à plat filtrées par programme (séries, exercices, séances),
+    regroupées par parent en une passe : le nombre de requêtes ne dépend plus
+    du nombre de séances ni d'exercices.
+    """
+    # Toutes les séries du programme, par seance_exercice
+    cursor.execute("""
+        SELECT 
+            sr.seance_exercice_id,
+            sr.numero_serie,
+            sr.poids_kg,
+            sr.repetitions,
+            sr.duree_sec,
+            sr.distance_m,
+            sr.rpe,
+            sr.notes
+        FROM serie sr
+        JOIN seance_exercice se ON se.id = sr.seance_exercice_id
+        JOIN seance s ON s.id = se.seance_id
+        WHERE s.programme_id = ?
+        ORDER BY sr.numero_serie, sr.rowid
+    """, (prog_id,))
+    
+    series_par_se = defaultdict(list)
+    for se_id, numero, poids, repetitions, duree_sec, distance, rpe, notes_serie in cursor:
+        series_par_se[se_id].append({
+            "numero": numero,
+            "poids_kg": poids,
+            "repetitions": repetitions,
+            "duree_sec": duree_sec,
+            "distance_m": distance,
+            "rpe": rpe,
+            "notes": notes_serie
+        })
+    
+    # Tous les exercices du programme, par séance
+    cursor.execute("""
+        SELECT se.seance_id, e.id, e.nom, se.ordre, se.notes, se.id as seance_exercice_id
+        FROM seance_exercice se
+        JOIN exercice e ON se.exercice_id = e.id
+        JOIN seance s ON s.id = se.seance_id
+        WHERE s.programme_id = ?
+        ORDER BY se.ordre, se.rowid
+    """, (prog_id,))
+    
+    exercices_par_seance = defaultdict(list)
+    for seance_id, exercice_id, nom_exercice, ordre, notes, seance_exercice_id in cursor:
+        series = series_par_se.get(seance_exercice_id, [])
+        exercices_par_seance[seance_id].append({
+            "id": exercice_id,
+            "nom": nom_exercice,
+            "ordre": ordre,
+            "notes": notes,
+            "nombre_series": len(series),
+            "series": series
+        })
+    
+    # Séances, assemblées avec leurs exercices
+    cursor.execute("""
+        SELECT id, nom, date, commentaire, duree_min, statut 
+        FROM seance 
+        WHERE programme_id = ? 
+        ORDER BY date, rowid
+    """, (prog_id,))
+    
+    seances_data = []
+    for seance_id, nom_seance, date_seance, commentaire, duree, statut in cursor:
+        exercices = exercices_par_seance.get(seance_id, [])
+        seances_data.append({
+            "id": seance_id,
+            "nom": nom_seance,
+            "date": date_seance,
+            "duree_minutes": duree,
+            "statut": statut,
+            "commentaire": commentaire,
+            "nombre_exercices": len(exercices),
+            "exercices": exercices
+        })
+    
+    return seances_data
+
+
+def exporter_progression_musculation(conn, prog_id, should_close, out=None, as_bytes=False):
     """Export pour une base de type musculation"""
+    return _serialiser_json(_donnees_progression_musculation(conn, prog_id, should_close), out, as_bytes)
+
+
+def _donnees_progression_musculation(conn, prog_id, should_close):
+    """Document d'export musculation, avant sérialisation"""
     
     try:
         cursor = conn.cursor()
+        # Tuples simples (dépaquetage direct) même si la connexion utilise sqlite3.Row
+        cursor.row_factory = None
         
         # Récupération du programme
         cursor.execute("""
@@ -280,10 +567,10 @@ def exporter_progression_musculation(conn, prog_id, should_close):
         prog_data = cursor.fetchone()
         
         if not prog_data:
-            return json.dumps({
+            return {
                 "erreur": "Programme non trouvé",
                 "prog_id": prog_id
-            }, indent=2, ensure_ascii=False)
+            }
         
         # Structure principale
         export_data = {
@@ -307,201 +594,263 @@ def exporter_progression_musculation(conn, prog_id, should_close):
             "seances": []
         }
         
-        # Récupération des séances
-        cursor.execute("""
-            SELECT id, nom, date, commentaire, duree_min, statut 
-            FROM seance 
-            WHERE programme_id = ? 
-            ORDER BY date
-        """, (prog_id,))
+        # Arbre séances → exercices → séries : assemblé par SQLite en une requête
+        # quand les fonctions JSON sont disponibles, sinon parcouru en Python
+        seances = None
+        if _JSON_SQL_DISPONIBLE:
+            try:
+                seances = _seances_musculation_sql(cursor, prog_id)
+            except sqlite3.OperationalError:
+                # Schéma ou build SQLite sans support : parcours Python
+                seances = None
+        if seances is None:
+            seances = _seances_musculation_python(cursor, prog_id)
         
-        seances = cursor.fetchall()
+        export_data["seances"] = seances
         export_data["statistiques"]["nombre_seances"] = len(seances)
         
-        # Traitement de chaque séance
-        for seance in seances:
-            seance_id, nom_seance, date_seance, commentaire, duree, statut = seance
-            
-            seance_data = {
-                "id": seance_id,
-                "nom": nom_seance,
-                "date": date_seance,
-                "duree_minutes": duree,
-                "statut": statut,
-                "commentaire": commentaire,
-                "nombre_exercices": 0,
-                "exercices": []
-            }
-            
-            # Récupération des exercices
-            cursor.execute("""
-                SELECT e.id, e.nom, se.ordre, se.notes, se.id as seance_exercice_id
-                FROM seance_exercice se
-                JOIN exercice e ON se.exercice_id = e.id
-                WHERE se.seance_id = ?
-                ORDER BY se.ordre
-            """, (seance_id,))
-            
-            exercices = cursor.fetchall()
-            seance_data["nombre_exercices"] = len(exercices)
-            
-            # Traitement de chaque exercice
-            for exercice in exercices:
-                exercice_id, nom_exercice, ordre, notes, seance_exercice_id = exercice
-                
-                exercice_data = {
-                    "id": exercice_id,
-                    "nom": nom_exercice,
-                    "ordre": ordre,
-                    "notes": notes,
-                    "nombre_series": 0,
-                    "series": []
-                }
-                
-                # Récupération des séries
-                cursor.execute("""
-                    SELECT 
-                        numero_serie,
-                        poids_kg,
-                        repetitions,
-                        duree_sec,
-                        distance_m,
-                        rpe,
-                        notes
-                    FROM serie
-                    WHERE seance_exercice_id = ?
-                    ORDER BY numero_serie
-                """, (seance_exercice_id,))
-                
-                series = cursor.fetchall()
-                exercice_data["nombre_series"] = len(series)
-                
-                # Ajout des séries
-                for serie in series:
-                    serie_data = {
-                        "numero": serie[0],
-                        "poids_kg": serie[1],
-                        "repetitions": serie[2],
-                        "duree_sec": serie[3],
-                        "distance_m": serie[4],
-                        "rpe": serie[5],
-                        "notes": serie[6]
-                    }
-                    exercice_data["series"].append(serie_data)
-                
-                seance_data["exercices"].append(exercice_data)
-            
-            export_data["seances"].append(seance_data)
-        
-        return json.dumps(export_data, indent=2, ensure_ascii=False)
+        return export_data
     
     except Exception as e:
-        return json.dumps({
+        return {
             "erreur": str(e),
             "type_erreur": type(e).__name__
-        }, indent=2, ensure_ascii=False)
+        }
     
     finally:
         if should_close:
             conn.close()
 
 
+# ============================================================
+# EXPORT DE PLUSIEURS PROGRAMMES EN PARALLÈLE
+# ============================================================
+
+def exporter_progressions_batch(db_path, prog_ids, max_workers=8):
+    """
+    Exporte plusieurs programmes en parallèle
+    
+    Chaque export est une lecture pure : en mode WAL, les lecteurs ne se
+    bloquent pas entre eux, chaque thread ouvre donc sa propre connexion
+    en lecture seule.
+    
+    Args:
+        db_path: Chemin du fichier de base de données
+        prog_ids: IDs des programmes à exporter
+        max_workers: Nombre maximal de threads
+    
+    Returns:
+        dict: {prog_id: JSON exporté}, dans l'ordre de prog_ids
+    """
+    prog_ids = list(dict.fromkeys(prog_ids))  # sans doublons, ordre conservé
+    if not prog_ids:
+        return {}
+    
+    # exporter_progression ouvre un chemin en lecture seule, une connexion par appel
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(prog_ids))) as pool:
+        resultats = pool.map(exporter_progression, [db_path] * len(prog_ids), prog_ids)
+        return dict(zip(prog_ids, resultats))
+
+
+def get_export_stats(db, prog_id):
+    """
+    Volume d'un export, calculé par des COUNT indexés sans construire le JSON
+    
+    Args:
+        db: Objet DatabaseSchema ou connexion SQLite ou chemin string
+        prog_id: ID du programme
+    
+    Returns:
+        dict: Comptages (mêmes clés que "statistiques" de l'export),
+            None si la base ne peut pas être lue
+    """
+    # Un chemin est ouvert en lecture seule, comme pour l'export
+    connexion_ro = None
+    if hasattr(db, 'conn'):
+        conn = db.conn
+    else:
+        conn = db
+    
+    db_path = getattr(db, 'db_path', db if isinstance(db, str) else None)
+    
+    try:
+        if isinstance(conn, str):
+            conn = connexion_ro = _connexion_lecture_seule(conn)
+        
+        if _est_base_learning(conn, db_path):
+            nb_semaines, nb_jours, nb_contenus = conn.execute("""
+                SELECT
+                    (SELECT COUNT(*) FROM semaines WHERE programme_id = :prog_id),
+                    (SELECT COUNT(*) FROM jours j
+                     JOIN semaines s ON s.id = j.semaine_id
+                     WHERE s.programme_id = :prog_id),
+                    (SELECT COUNT(*) FROM contenus c
+                     JOIN jours j ON j.id = c.jour_id
+                     JOIN semaines s ON s.id = j.semaine_id
+                     WHERE s.programme_id = :prog_id)
+            """, {"prog_id": prog_id}).fetchone()
+            return {
+                "nombre_semaines": nb_semaines,
+                "nombre_jours": nb_jours,
+                "nombre_contenus": nb_contenus
+            }
+        
+        nb_seances, nb_exercices, nb_series = conn.execute("""
+            SELECT
+                (SELECT COUNT(*) FROM seance WHERE programme_id = :prog_id),
+                (SELECT COUNT(*) FROM seance_exercice se
+                 JOIN seance s ON s.id = se.seance_id
+                 WHERE s.programme_id = :prog_id),
+                (SELECT COUNT(*) FROM serie sr
+                 JOIN seance_exercice se ON se.id = sr.seance_exercice_id
+                 JOIN seance s ON s.id = se.seance_id
+                 WHERE s.programme_id = :prog_id)
+        """, {"prog_id": prog_id}).fetchone()
+        return {
+            "nombre_seances": nb_seances,
+            "nombre_exercices": nb_exercices,
+            "nombre_series": nb_series
+        }
+    
+    except sqlite3.Error:
+        return None
+    
+    finally:
+        if connexion_ro is not None:
+            connexion_ro.close()
+
+
 # ============================================================
 # FONCTION D'IMPORT DE PROGRESSION
 # ============================================================
 
+def _charger_json(source):
+    """
+    Décode un document JSON fourni en texte, en octets ou sous forme de fichier
+    
+    Les octets (fichier téléversé, fichier ouvert en 'rb') sont décodés
+    directement, sans passer par une chaîne intermédiaire.
+    """
+    if hasattr(source, 'read'):
+        source = source.read()
+    if isinstance(source, memoryview):
+        source = bytes(source)
+    
+    if orjson is not None:
+        return orjson.loads(source)
+    return json.loads(source)
+
+
+# Import de la progression : l'arbre semaines → jours → contenus est parcouru par
+# SQLite (json_each) directement dans le document JSON brut passé en paramètre :doc.
+# Lignes retenues : contenus dont la progression a un statut renseigné. La clé
+# "date_fin" du format d'export alimente la colonne date_completion.
+_SQL_TYPE_BASE_JSON = """
+    SELECT json_valid(:doc),
+           CASE WHEN json_valid(:doc) THEN
+               CASE WHEN json_type(:doc, '$.type_base') IS NULL THEN 'learning'
+                    ELSE json_extract(:doc, '$.type_base') END
+           END
+"""
+
+_SQL_LIGNES_PROGRESSION_JSON = """
+    WITH lignes (contenu_id, statut, date_debut, date_completion, temps_passe, notes) AS (
+        SELECT json_extract(c.value, '$.id'),
+               json_extract(c.value, '$.progression.statut'),
+               json_extract(c.value, '$.progression.date_debut'),
+               json_extract(c.value, '$.progression.date_fin'),
+               json_extract(c.value, '$.progression.temps_passe'),
+               json_extract(c.value, '$.progression.notes')
+        FROM json_each(:doc, '$.semaines') s
+        JOIN json_each(s.value, '$.jours') j
+        JOIN json_each(j.value, '$.contenus') c
+    )
+"""
+
+_SQL_PROGRESSION_INCONNUS_JSON = _SQL_LIGNES_PROGRESSION_JSON + """
+    SELECT COUNT(*) FROM lignes
+    WHERE coalesce(statut, '') NOT IN ('', 0)
+      AND NOT EXISTS (SELECT 1 FROM contenus WHERE id = lignes.contenu_id)
+"""
+
+# Lignes lues dans l'ordre du document : un contenu répété garde sa dernière valeur
+_SQL_UPSERT_PROGRESSION_JSON = _SQL_LIGNES_PROGRESSION_JSON + """
+    INSERT INTO progression 
+    (contenu_id, statut, date_debut, date_completion, temps_passe, notes)
+    SELECT * FROM lignes
+    WHERE coalesce(statut, '') NOT IN ('', 0)
+      AND EXISTS (SELECT 1 FROM contenus WHERE id = lignes.contenu_id)
+    ON CONFLICT(contenu_id) DO UPDATE SET
+        statut = excluded.statut,
+        date_debut = excluded.date_debut,
+        date_completion = excluded.date_completion,
+        temps_passe = excluded.temps_passe,
+        notes = excluded.notes
+"""
+
+
+def _texte_json(source):
+    """Document JSON (dict, texte, octets ou fichier) ramené à une str, sans décodage JSON"""
+    if isinstance(source, dict):
+        # Déjà décodé : resérialisé d'une traite pour le parcours SQLite
+        tampon = io.StringIO()
+        _serialiser_json(source, tampon)
+        return tampon.getvalue()
+    if hasattr(source, 'read'):
+        source = source.read()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = bytes(source).decode('utf-8')
+    return source
+
+
 def importer_progression(db, json_data):
     """
     Importe la progression depuis des données JSON
     
     Args:
         db: Objet DatabaseSchema ou connexion SQLite
-        json_data: Dictionnaire Python (déjà parsé) ou string JSON
+        json_data: Dictionnaire Python (déjà parsé), ou JSON en str, en bytes
+            ou sous forme de fichier
     
     Returns:
         dict: Statistiques de l'import {nb_importes, nb_erreurs, succes}
     """
     
-    # Gérer le cas où json_data est déjà un dict ou une string
-    if isinstance(json_data, str):
-        data = json.loads(json_data)
-    else:
-        data = json_data
-    
-    # Détection du type de DB
+    # Détection du type de DB (un chemin emprunte une connexion au pool de DatabaseSchema)
+    schema = None
     if hasattr(db, 'conn'):
         conn = db.conn
-        should_close = False
     elif isinstance(db, str):
-        conn = sqlite3.connect(db)
-        should_close = True
+        schema = DatabaseSchema(db)
+        conn = schema.connect()
     else:
         conn = db
-        should_close = False
     
     try:
+        # Le document est parcouru par SQLite (json_each) : un dict est resérialisé.
+        # Décodé ici pour qu'un fichier qui n'est pas en UTF-8 donne un résultat d'erreur
+        texte = _texte_json(json_data)
+        
+        # Une seule transaction, verrou d'écriture pris dès le départ
+        if not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+        
         cursor = conn.cursor()
         nb_importes = 0
         nb_erreurs = 0
         
-        # Vérifier le type de base
-        type_base = data.get("type_base", "learning")
+        json_valide, type_base = cursor.execute(_SQL_TYPE_BASE_JSON, {"doc": texte}).fetchone()
+        if not json_valide:
+            raise ValueError("Document JSON invalide")
         
         if type_base == "learning":
-            # Import pour base learning
-            if "semaines" in data:
-                for semaine in data["semaines"]:
-                    for jour in semaine.get("jours", []):
-                        for contenu in jour.get("contenus", []):
-                            prog = contenu.get("progression")
-                            
-                            if prog and prog.get("statut"):
-                                try:
-                                    # Vérifier si une progression existe
-                                    cursor.execute("""
-                                        SELECT id FROM progression 
-                                        WHERE contenu_id = ?
-                                    """, (contenu["id"],))
-                                    
-                                    existe = cursor.fetchone()
-                                    
-                                    if existe:
-                                        # Mise à jour
-                                        cursor.execute("""
-                                            UPDATE progression 
-                                            SET statut = ?,
-                                                date_debut = ?,
-                                                date_fin = ?,
-                                                temps_passe = ?,
-                                                notes = ?
-                                            WHERE contenu_id = ?
-                                        """, (
-                                            prog["statut"],
-                                            prog.get("date_debut"),
-                                            prog.get("date_fin"),
-                                            prog.get("temps_passe"),
-                                            prog.get("notes"),
-                                            contenu["id"]
-                                        ))
-                                    else:
-                                        # Insertion
-                                        cursor.execute("""
-                                            INSERT INTO progression 
-                                            (contenu_id, statut, date_debut, date_fin, temps_passe, notes)
-                                            VALUES (?, ?, ?, ?, ?, ?)
-                                        """, (
-                                            contenu["id"],
-                                            prog["statut"],
-                                            prog.get("date_debut"),
-                                            prog.get("date_fin"),
-                                            prog.get("temps_passe"),
-                                            prog.get("notes")
-                                        ))
-                                    
-                                    nb_importes += 1
-                                    
-                                except Exception as e:
-                                    nb_erreurs += 1
+            # Parcours et écriture en deux instructions, quelle que soit la taille de l'arbre
+            cursor.execute(_SQL_PROGRESSION_INCONNUS_JSON, {"doc": texte})
+            nb_erreurs = cursor.fetchone()[0]
+            # (rowcount n'est pas renseigné pour une instruction commençant par WITH)
+            avant = conn.total_changes
+            cursor.execute(_SQL_UPSERT_PROGRESSION_JSON, {"doc": texte})
+            nb_importes = conn.total_changes - avant
         
         conn.commit()
         
@@ -522,14 +871,107 @@ def importer_progression(db, json_data):
         }
     
     finally:
-        if should_close:
-            conn.close()
+        if schema is not None:
+            schema.disconnect()
 
 
 # ============================================================
 # IMPORT DE PROGRAMME COMPLET DEPUIS CSV
 # ============================================================
 
+# Requêtes d'insertion, construites une seule fois au chargement du module
+_SQL_INSERT_PROGRAMME = """
+    INSERT INTO programmes (id, nom, description, sujet, duree_jours)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO NOTHING
+"""
+
+# Colonnes écrites par lots (ordre des tuples construits par les méthodes _creer_*)
+_COLONNES_SEMAINE = ("id", "programme_id", "numero", "titre", "objectif", "temps_quotidien", "ordre")
+_COLONNES_JOUR = ("id", "semaine_id", "numero", "nom", "type", "ordre")
+_COLONNES_CONTENU = ("id", "jour_id", "titre", "type", "description", "enonce",
+                     "indice", "difficulte", "temps_estime", "ordre")
+
+# IDs déterministes : un réimport ne crée pas de doublon ni d'échec de clé primaire.
+# Programme, semaines et jours existants sont conservés ; les contenus sont
+# rafraîchis, sauf leur ordre (un réimport ne les déplace pas dans leur jour)
+_CONFLIT_IGNORER = "ON CONFLICT(id) DO NOTHING"
+_CONFLIT_CONTENU = "ON CONFLICT(id) DO UPDATE SET " + ", ".join(
+    f"{col} = excluded.{col}" for col in _COLONNES_CONTENU if col not in ("id", "ordre")
+)
+
+# Colonnes du CSV, dans l'ordre attendu par les méthodes _creer_*
+_COLONNES_CSV = ("Type", "Semaine", "Jour", "Titre", "Description",
+                 "Enonce", "Indice", "Difficulte", "TempsEstime")
+_NB_CHAMPS_CSV = len(_COLONNES_CSV)
+_CHAMPS_CSV = itemgetter(*range(_NB_CHAMPS_CSV))
+_LIGNE_VIDE = [""] * _NB_CHAMPS_CSV
+
+# Valeurs reconnues dans la colonne Type (les autres lignes sont ignorées)
+_TYPES_CONTENU = frozenset(('theorie', 'exercice', 'projet', 'ressource'))
+
+# Index (parent, ordre) parcourus par les exports ; déjà créés par DatabaseSchema,
+# recréés ici pour les bases qui n'en viennent pas
+_INDEX_IMPORT = (
+    "CREATE INDEX IF NOT EXISTS idx_semaines_programme_ordre ON semaines(programme_id, ordre)",
+    "CREATE INDEX IF NOT EXISTS idx_jours_semaine_ordre ON jours(semaine_id, ordre)",
+    "CREATE INDEX IF NOT EXISTS idx_contenus_jour_ordre ON contenus(jour_id, ordre)",
+)
+
+def _sem_id(prog_id, semaine_num):
+    """ID déterministe d'une semaine importée"""
+    return f"sem_{prog_id}_{semaine_num}"
+
+
+def _jour_id(semaine_id, jour_num):
+    """ID déterministe d'un jour importé"""
+    return f"jour_{semaine_id}_{jour_num}"
+
+
+@lru_cache(maxsize=512)
+def _entier_optionnel(texte):
+    """Colonne numérique facultative (Difficulte, TempsEstime) : int, ou None si vide/invalide"""
+    if not texte:
+        return None
+    try:
+        return int(texte)
+    except ValueError:
+        return None
+
+
+# Limite de paramètres par requête : 999 sur les SQLite antérieurs à 3.32
+_MAX_PARAMS_SQLITE = 900
+
+
+def _bulk_insert(cursor, table, cols, rows, max_params=_MAX_PARAMS_SQLITE, conflit=""):
+    """
+    Insère des lignes avec des INSERT multi-lignes (VALUES (...), (...), ...)
+    
+    Chaque instruction porte autant de lignes que la limite de paramètres le
+    permet : une seule exécution SQLite par paquet au lieu d'une par ligne.
+    Les paquets complets partagent le même texte SQL (cache de requêtes).
+    conflit : clause ON CONFLICT optionnelle ajoutée à chaque instruction.
+    """
+    if not rows:
+        return
+    
+    par_paquet = max(1, max_params // len(cols))
+    ligne_sql = "(" + ", ".join("?" * len(cols)) + ")"
+    debut_sql = f"INSERT INTO {table} ({', '.join(cols)}) VALUES "
+    fin_sql = f" {conflit}" if conflit else ""
+    sql_paquet = debut_sql + ", ".join([ligne_sql] * par_paquet) + fin_sql
+    
+    for i in range(0, len(rows), par_paquet):
+        paquet = rows[i:i + par_paquet]
+        sql = (sql_paquet if len(paquet) == par_paquet
+               else debut_sql + ", ".join([ligne_sql] * len(paquet)) + fin_sql)
+        cursor.execute(sql, list(chain.from_iterable(paquet)))
+
+
+# Nombre de contenus accumulés avant écriture (mémoire bornée quelle que soit la taille du CSV)
+_TAILLE_LOT = 1000
+
+
 class ProgrammeImporter:
     """Classe pour importer des programmes depuis CSV"""
     
@@ -542,15 +984,29 @@ class ProgrammeImporter:
             self.conn = db.conn
         else:
             self.conn = db
+        
+        # Dernier ordre attribué par jour, suivi en mémoire (pas de SELECT COUNT(*))
+        self._ordre_par_jour = defaultdict(int)
+        
+        self._assurer_index()
+        
+        # Traitement de chaque ligne selon sa colonne Type (une recherche de dict par ligne)
+        self._handlers = {
+            'semaine': self._creer_semaine,
+            'jour': self._creer_jour,
+            **dict.fromkeys(_TYPES_CONTENU, self._creer_contenu)
+        }
     
-    def importer_depuis_csv(self, csv_file, nom_programme, sujet):
+    def importer_depuis_csv(self, csv_file, nom_programme, sujet, fast_mode=False):
         """
         Importe un programme depuis un fichier CSV
         
         Args:
-            csv_file: Objet file-like du CSV
+            csv_file: Objet file-like du CSV, ou chemin du fichier
             nom_programme: Nom du programme à créer
             sujet: Sujet du programme
+            fast_mode: Applique les PRAGMAs d'écriture massive (synchronous OFF,
+                cache agrandi) le temps de l'import, puis les rétablit
         
         Returns:
             dict: Statistiques de l'import
@@ -558,134 +1014,237 @@ class ProgrammeImporter:
         import csv
         from datetime import date
         
+        if isinstance(csv_file, (str, os.PathLike)):
+            # Tampon de lecture de 1 Mo ; les lignes sont ensuite lues au fil de l'eau
+            with open(csv_file, 'r', encoding='utf-8', newline='', buffering=1 << 20) as f:
+                return self.importer_depuis_csv(f, nom_programme, sujet, fast_mode)
+        
+        pragmas_origine = apply_bulk_pragmas(self.conn) if fast_mode else None
+        
         try:
-            reader = csv.DictReader(csv_file)
-            cursor = self.conn.cursor()
-            
-            # Créer le programme
-            prog_id = f"prog_{sujet.lower().replace(' ', '_')}"
-            
-            cursor.execute("""
-                INSERT INTO programmes (id, nom, description, sujet, duree_jours)
-                VALUES (?, ?, ?, ?, ?)
-            """, (prog_id, nom_programme, f"Programme {nom_programme}", sujet, 30))
-            
-            semaines_cache = {}
-            jours_cache = {}
-            
-            nb_semaines = 0
-            nb_jours = 0
-            nb_contenus = 0
-            erreurs = []
-            
-            for row_num, row in enumerate(reader, start=2):
-                try:
-                    type_ligne = row.get('Type', '').lower().strip()
-                    semaine_num = int(row.get('Semaine', 0))
+            # Une seule transaction : commit en sortie, rollback sur exception
+            with self.conn:
+                # Verrou d'écriture pris dès le départ plutôt qu'au premier INSERT
+                if not self.conn.in_transaction:
+                    self.conn.execute("BEGIN IMMEDIATE")
+                
+                reader = csv.reader(csv_file)
+                
+                # En-tête résolu une fois en positions : colonnes réordonnées seulement
+                # si le fichier ne suit pas l'ordre du modèle
+                entete = [nom.strip() for nom in next(reader, None) or []]
+                reordonner = None
+                if tuple(entete[:_NB_CHAMPS_CSV]) != _COLONNES_CSV:
+                    positions = {nom: i for i, nom in enumerate(entete)}
+                    reordonner = [positions.get(nom) for nom in _COLONNES_CSV]
+                
+                cursor = self.conn.cursor()
+                
+                # Créer le programme
+                prog_id = f"prog_{sujet.lower().replace(' ', '_')}"
+                
+                cursor.execute(
+                    _SQL_INSERT_PROGRAMME,
+                    (prog_id, nom_programme, f"Programme {nom_programme}", sujet, 30)
+                )
+                
+                # Dans la transaction : les clés étrangères ne sont plus
+                # vérifiées ligne à ligne mais en une fois au COMMIT
+                cursor.execute("PRAGMA defer_foreign_keys = ON")
+                
+                # Ordre courant des jours déjà en base (import partiel), lu en une requête ;
+                # repart de zéro à chaque import (la base a pu changer depuis le précédent)
+                cursor.execute("""
+                    SELECT c.jour_id, MAX(c.ordre)
+                    FROM contenus c
+                    JOIN jours j ON j.id = c.jour_id
+                    JOIN semaines s ON s.id = j.semaine_id
+                    WHERE s.programme_id = ?
+                    GROUP BY c.jour_id
+                """, (prog_id,))
+                self._ordre_par_jour = defaultdict(
+                    int, ((jour_id, ordre or 0) for jour_id, ordre in cursor)
+                )
+                
+                # État de l'import en cours, partagé avec les méthodes _creer_*
+                self._cursor = cursor
+                self._prog_id = prog_id
+                self._semaines_vues = set()
+                self._jours_cache = {}  # (semaine, jour) -> jour_id, une seule recherche par contenu
+                self._compteurs = {'semaine': 0, 'jour': 0, 'contenu': 0}
+                self._erreurs = []
+                
+                # Lignes à insérer, écrites par lots via executemany
+                self._semaines_rows = []
+                self._jours_rows = []
+                self._contenus_rows = []
+                self._index_contenus = None  # CREATE INDEX à rejouer si supprimés
+                
+                handlers = self._handlers
+                erreurs = self._erreurs
+                
+                for row_num, ligne in enumerate(reader, start=2):
+                    if reordonner is not None and ligne:
+                        ligne = [
+                            ligne[i] if i is not None and i < len(ligne) else ""
+                            for i in reordonner
+                        ]
                     
-                    if not type_ligne or not semaine_num:
+                    # Lignes vides et commentaires écartées avant tout découpage
+                    if not ligne or not ligne[0] or ligne[0][0] == '#':
                         continue
                     
-                    # SEMAINE
-                    if type_ligne == 'semaine':
-                        titre = row.get('Titre', f'Semaine {semaine_num}')
-                        objectif = row.get('Description', '')
-                        temps = row.get('TempsEstime', '2h')
-                        
-                        semaine_id = f"sem_{prog_id}_{semaine_num}"
-                        
-                        cursor.execute("""
-                            INSERT INTO semaines 
-                            (id, programme_id, numero, titre, objectif, temps_quotidien, ordre)
-                            VALUES (?, ?, ?, ?, ?, ?, ?)
-                        """, (semaine_id, prog_id, semaine_num, titre, objectif, temps, semaine_num))
-                        
-                        semaines_cache[semaine_num] = semaine_id
-                        nb_semaines += 1
+                    type_ligne = ligne[0].lower().strip()
+                    handler = handlers.get(type_ligne)
+                    if handler is None:
+                        continue
                     
-                    # JOUR
-                    elif type_ligne == 'jour':
-                        jour_num = int(row.get('Jour', 1))
+                    try:
+                        # Lignes courtes complétées sur place (pas de copie pour les lignes complètes)
+                        if len(ligne) < _NB_CHAMPS_CSV:
+                            ligne += _LIGNE_VIDE
                         
-                        if semaine_num not in semaines_cache:
-                            erreurs.append(f"Ligne {row_num}: Semaine {semaine_num} non trouvée")
+                        semaine_num = int(ligne[1])
+                        if not semaine_num:
                             continue
                         
-                        semaine_id = semaines_cache[semaine_num]
-                        jour_type = 'weekend' if jour_num >= 99 else 'normal'
-                        jour_nom = f"jour_{jour_num}" if jour_num < 99 else "weekend"
-                        
-                        jour_id = f"jour_{semaine_id}_{jour_num}"
-                        
-                        cursor.execute("""
-                            INSERT INTO jours 
-                            (id, semaine_id, numero, nom, type, ordre)
-                            VALUES (?, ?, ?, ?, ?, ?)
-                        """, (jour_id, semaine_id, jour_num, jour_nom, jour_type, jour_num))
-                        
-                        jours_cache[(semaine_num, jour_num)] = jour_id
-                        nb_jours += 1
+                        handler(row_num, type_ligne, semaine_num, ligne)
                     
-                    # CONTENU
-                    elif type_ligne in ['theorie', 'exercice', 'projet', 'ressource']:
-                        jour_num = int(row.get('Jour', 1))
-                        
-                        if (semaine_num, jour_num) not in jours_cache:
-                            erreurs.append(f"Ligne {row_num}: Jour {jour_num} de semaine {semaine_num} non trouvé")
-                            continue
-                        
-                        jour_id = jours_cache[(semaine_num, jour_num)]
-                        
-                        titre = row.get('Titre', 'Sans titre')
-                        description = row.get('Description', '')
-                        enonce = row.get('Enonce', '')
-                        indice = row.get('Indice', '')
-                        
-                        try:
-                            difficulte = int(row.get('Difficulte', 0)) if row.get('Difficulte') else None
-                        except:
-                            difficulte = None
-                        
-                        try:
-                            temps_estime = int(row.get('TempsEstime', 0)) if row.get('TempsEstime') else None
-                        except:
-                            temps_estime = None
-                        
-                        contenu_id = f"cont_{jour_id}_{nb_contenus}"
-                        
-                        cursor.execute("""
-                            INSERT INTO contenus 
-                            (id, jour_id, titre, type, description, enonce, 
-                             indice, difficulte, temps_estime, ordre)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """, (
-                            contenu_id, jour_id, titre, type_ligne, description,
-                            enonce, indice, difficulte, temps_estime, nb_contenus
-                        ))
-                        
-                        nb_contenus += 1
+                    except Exception as e:
+                        erreurs.append(f"Ligne {row_num}: {str(e)}")
                 
-                except Exception as e:
-                    erreurs.append(f"Ligne {row_num}: {str(e)}")
-            
-            self.conn.commit()
-            
-            return {
-                "succes": True,
-                "programme_id": prog_id,
-                "nb_semaines": nb_semaines,
-                "nb_jours": nb_jours,
-                "nb_contenus": nb_contenus,
-                "erreurs": erreurs
-            }
+                # Dernier lot
+                self._inserer_lots()
+                
+                # Index reconstruits en une passe triée, dans la même transaction
+                if self._index_contenus:
+                    restore_indexes(self.conn, self._index_contenus)
         
         except Exception as e:
-            self.conn.rollback()
             return {
                 "succes": False,
                 "erreur": str(e),
                 "erreurs": [str(e)]
             }
+        
+        finally:
+            if pragmas_origine:
+                restore_pragmas(self.conn, pragmas_origine)
+        
+        # Statistiques du planificateur à jour pour les tables remplies,
+        # afin que les index (parent, ordre) soient retenus dès l'import terminé
+        try:
+            self.conn.execute("PRAGMA analysis_limit = 400")
+            for table in ("semaines", "jours", "contenus"):
+                self.conn.execute(f"ANALYZE {table}")
+            self.conn.commit()
+        except sqlite3.Error:
+            pass
+        
+        return {
+            "succes": True,
+            "programme_id": prog_id,
+            "nb_semaines": self._compteurs['semaine'],
+            "nb_jours": self._compteurs['jour'],
+            "nb_contenus": self._compteurs['contenu'],
+            "erreurs": erreurs
+        }
+    
+    def _creer_semaine(self, row_num, type_ligne, semaine_num, ligne):
+        """Ligne 'semaine' : Titre, Description (objectif), TempsEstime (temps quotidien)"""
+        if semaine_num in self._semaines_vues:
+            self._erreurs.append(f"Ligne {row_num}: Semaine {semaine_num} en double")
+            return
+        
+        semaine_id = _sem_id(self._prog_id, semaine_num)
+        
+        self._semaines_rows.append(
+            (semaine_id, self._prog_id, semaine_num, ligne[3], ligne[4], ligne[8], semaine_num)
+        )
+        
+        self._semaines_vues.add(semaine_num)
+        self._compteurs['semaine'] += 1
+    
+    def _creer_jour(self, row_num, type_ligne, semaine_num, ligne):
+        """Ligne 'jour' : rattachée à une semaine déjà lue"""
+        jour_num = int(ligne[2])
+        
+        if semaine_num not in self._semaines_vues:
+            self._erreurs.append(f"Ligne {row_num}: Semaine {semaine_num} non trouvée")
+            return
+        
+        if (semaine_num, jour_num) in self._jours_cache:
+            self._erreurs.append(f"Ligne {row_num}: Jour {jour_num} de semaine {semaine_num} en double")
+            return
+        
+        semaine_id = _sem_id(self._prog_id, semaine_num)
+        jour_type = 'weekend' if jour_num >= 99 else 'normal'
+        jour_nom = f"jour_{jour_num}" if jour_num < 99 else "weekend"
+        
+        jour_id = _jour_id(semaine_id, jour_num)
+        
+        self._jours_rows.append(
+            (jour_id, semaine_id, jour_num, jour_nom, jour_type, jour_num)
+        )
+        
+        self._jours_cache[(semaine_num, jour_num)] = jour_id
+        self._compteurs['jour'] += 1
+    
+    def _creer_contenu(self, row_num, type_ligne, semaine_num, ligne):
+        """Ligne de contenu (theorie, exercice, projet, ressource) : rattachée à un jour déjà lu"""
+        (_, _, jour_str, titre, description,
+         enonce, indice, difficulte_str, temps_str) = _CHAMPS_CSV(ligne)
+        
+        jour_num = int(jour_str)
+        
+        jour_id = self._jours_cache.get((semaine_num, jour_num))
+        if jour_id is None:
+            self._erreurs.append(f"Ligne {row_num}: Jour {jour_num} de semaine {semaine_num} non trouvé")
+            return
+        
+        # Peu de valeurs distinctes (1 à 5, 15, 20...) : conversions mémorisées
+        difficulte = _entier_optionnel(difficulte_str)
+        temps_estime = _entier_optionnel(temps_str)
+        
+        # Ordre du contenu dans son jour, calculé en mémoire
+        self._ordre_par_jour[jour_id] += 1
+        
+        contenu_id = f"cont_{jour_id}_{self._compteurs['contenu']}"
+        
+        self._contenus_rows.append((
+            contenu_id, jour_id, titre, type_ligne, description,
+            enonce, indice, difficulte, temps_estime, self._ordre_par_jour[jour_id]
+        ))
+        self._compteurs['contenu'] += 1
+        
+        if len(self._contenus_rows) >= _TAILLE_LOT:
+            # Import volumineux (au moins un lot plein) : index secondaires de
+            # contenus supprimés pendant l'insertion plutôt que mis à jour ligne à ligne
+            if self._index_contenus is None:
+                self._index_contenus = drop_secondary_indexes(self.conn, "contenus")
+            self._inserer_lots()
+    
+    def _assurer_index(self):
+        """Crée les index (parent, ordre) s'ils manquent (sans effet si déjà présents)"""
+        for sql in _INDEX_IMPORT:
+            try:
+                self.conn.execute(sql)
+            except sqlite3.Error:
+                # Table absente : l'import échouera de toute façon avec un message clair
+                pass
+    
+    def _inserer_lots(self):
+        """Écrit les lignes accumulées (parents avant enfants) puis vide les lots"""
+        _bulk_insert(self._cursor, "semaines", _COLONNES_SEMAINE, self._semaines_rows,
+                     conflit=_CONFLIT_IGNORER)
+        _bulk_insert(self._cursor, "jours", _COLONNES_JOUR, self._jours_rows,
+                     conflit=_CONFLIT_IGNORER)
+        _bulk_insert(self._cursor, "contenus", _COLONNES_CONTENU, self._contenus_rows,
+                     conflit=_CONFLIT_CONTENU)
+        
+        self._semaines_rows.clear()
+        self._jours_rows.clear()
+        self._contenus_rows.clear()
     
     def generer_template_csv(self):
         """Génère un template CSV vide"""
@@ -707,45 +1266,54 @@ theorie,1,2,Les types de données,Nombres et strings,,,,20
 
 def importer_programme(db, fichier_json):
     """
-    Importe un programme depuis un fichier JSON
+    Importe un programme depuis un fichier JSON (str, bytes ou fichier)
+    ou depuis un dictionnaire déjà décodé
     (Conservé pour compatibilité)
     """
     try:
-        data = json.loads(fichier_json)
+        # Document déjà décodé par l'appelant : pas de second parsing
+        data = fichier_json if isinstance(fichier_json, dict) else _charger_json(fichier_json)
         
         if "programme" not in data:
             return False, "Structure JSON invalide: clé 'programme' manquante", None
         
         prog = data["programme"]
         
+        # Un chemin emprunte une connexion au pool de DatabaseSchema
+        schema = None
         if isinstance(db, str):
-            conn = sqlite3.connect(db)
-            should_close = True
+            schema = DatabaseSchema(db)
+            conn = schema.connect()
         else:
             conn = db
-            should_close = False
+        
+        # PRAGMAs d'écriture massive (database_schema) le temps de l'import
+        pragmas_origine = apply_bulk_pragmas(conn)
         
         try:
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO programme (nom, description, date_debut, date_fin, statut)
-                VALUES (?, ?, ?, ?, ?)
-            """, (
-                prog.get("nom", "Programme importé"),
-                prog.get("description", ""),
-                prog.get("date_debut", datetime.now().strftime("%Y-%m-%d")),
-                prog.get("date_fin"),
-                prog.get("statut", "actif")
-            ))
+            # Une seule transaction : commit en sortie, rollback sur exception
+            with conn:
+                cursor = conn.cursor()
+                
+                cursor.execute("""
+                    INSERT INTO programme (nom, description, date_debut, date_fin, statut)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (
+                    prog.get("nom", "Programme importé"),
+                    prog.get("description", ""),
+                    prog.get("date_debut", datetime.now().strftime("%Y-%m-%d")),
+                    prog.get("date_fin"),
+                    prog.get("statut", "actif")
+                ))
+                
+                prog_id = cursor.lastrowid
             
-            prog_id = cursor.lastrowid
-            conn.commit()
             return True, f"Programme importé avec succès (ID: {prog_id})", prog_id
         
         finally:
-            if should_close:
-                conn.close()
+            restore_pragmas(conn, pragmas_origine)
+            if schema is not None:
+                schema.disconnect()
     
     except json.JSONDecodeError as e:
         return False, f"Erreur de parsing JSON: {str(e)}", None
@@ -775,6 +1343,108 @@ def valider_structure_json(data):
 # INTERFACE STREAMLIT (OPTIONNELLE)
 # ============================================================
 
+# Écrivain unique : les imports lancés depuis plusieurs sessions Streamlit sont
+# exécutés l'un après l'autre par ce thread, au lieu de se disputer le verrou
+# d'écriture SQLite depuis les threads de requête. Il reçoit le chemin de la base
+# et y ouvre sa propre connexion : celle de l'appelant ne change jamais de thread.
+_ECRIVAIN = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ecrivain-sqlite")
+
+
+def _chemin_base(db):
+    """Chemin du fichier d'un DatabaseSchema, d'une connexion ou d'un chemin ('' si base en mémoire)"""
+    if isinstance(db, str):
+        return db
+    if hasattr(db, 'db_path'):
+        return db.db_path
+    return db.execute("PRAGMA database_list").fetchone()[2]
+
+
+def _soumettre_ecriture(func, db, *args):
+    """
+    Place func(chemin_de_la_base, *args) dans la file de l'écrivain
+    
+    Returns:
+        Future à consulter avec done()/result() sans bloquer l'appelant ;
+        déjà résolu pour une base en mémoire (écrite dans le thread appelant)
+    """
+    db_path = _chemin_base(db)
+    if db_path and db_path != ":memory:" and not db_path.startswith("file:"):
+        return _ECRIVAIN.submit(func, db_path, *args)
+    
+    # Base propre à la connexion de l'appelant : pas d'autre thread possible
+    future = Future()
+    try:
+        future.set_result(func(db, *args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+# Horodatage des noms de fichiers (AAAAMMJJ_HHMMSS) tiré d'isoformat(), sans strftime
+_HORODATAGE_FICHIER = str.maketrans({"-": None, ":": None, "T": "_"})
+
+
+def _horodatage_fichier():
+    """Date et heure courantes au format des noms de fichiers d'export"""
+    return datetime.now().isoformat(timespec='seconds').translate(_HORODATAGE_FICHIER)
+
+
+def _version_base(db):
+    """
+    Jeton qui change à chaque écriture dans la base (clé d'invalidation du cache d'export)
+    
+    PRAGMA data_version ne bouge qu'avec les commits des autres connexions :
+    il est complété par total_changes pour les écritures de la connexion elle-même.
+    """
+    if isinstance(db, str):
+        # Chemin : dates de modification du fichier et de son journal WAL
+        return (os.path.abspath(db),) + tuple(
+            os.stat(chemin).st_mtime_ns if os.path.exists(chemin) else 0
+            for chemin in (db, db + "-wal")
+        )
+    
+    conn = db.conn if hasattr(db, 'conn') else db
+    data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+    return (id(conn), data_version, conn.total_changes)
+
+
+class _ExportEchoue(Exception):
+    """Export terminé sur une erreur : levée pour que st.cache_data ne le conserve pas"""
+
+
+@st.cache_data(show_spinner=False)
+def _exporter_en_cache(_db, prog_id, version):
+    """
+    Export mémorisé tant que la base n'a pas été modifiée (_db n'est pas haché)
+    
+    Returns:
+        dict: {"donnees": octets UTF-8 du JSON, "statistiques": statistiques de l'export}
+    """
+    data = _donnees_progression(_db, prog_id)
+    if "erreur" in data:
+        raise _ExportEchoue(data["erreur"])
+    
+    # Erreur et statistiques lues sur le document : le JSON produit n'est jamais relu.
+    # Octets UTF-8 tels que produits par orjson, transmis sans réencodage au téléchargement
+    return {
+        "donnees": _serialiser_json(data, as_bytes=True),
+        "statistiques": data["statistiques"]
+    }
+
+
+def _exporter_pour_telechargement(db, prog_id):
+    """
+    Export prêt à télécharger, servi depuis le cache tant que la base n'a pas changé
+    
+    Returns:
+        dict: {"donnees", "statistiques"} ou {"erreur"} (les erreurs ne sont pas mises en cache)
+    """
+    try:
+        return _exporter_en_cache(db, prog_id, _version_base(db))
+    except _ExportEchoue as e:
+        return {"erreur": str(e)}
+
+
 def interface_export_streamlit(db, prog_id):
     """Interface Streamlit pour l'export"""
     
@@ -784,22 +1454,31 @@ def interface_export_streamlit(db, prog_id):
     
     with col1:
         st.write("Exportez toutes les données de ce programme au format JSON.")
+        
+        # Volume annoncé par quelques COUNT : le JSON n'est construit qu'au clic
+        apercu = get_export_stats(db, prog_id)
+        if apercu and "nombre_semaines" in apercu:
+            st.caption(f"📊 {apercu['nombre_semaines']} semaine(s), {apercu['nombre_jours']} jour(s), "
+                       f"{apercu['nombre_contenus']} contenu(s)")
+        elif apercu:
+            st.caption(f"📊 {apercu['nombre_seances']} séance(s), {apercu['nombre_exercices']} exercice(s), "
+                       f"{apercu['nombre_series']} série(s)")
     
     with col2:
         if st.button("📥 Exporter", use_container_width=True):
             try:
-                json_data = exporter_progression(db, prog_id)
+                # Réexport gratuit tant que le programme n'a pas changé
+                export = _exporter_pour_telechargement(db, prog_id)
                 
-                data = json.loads(json_data)
-                if "erreur" in data:
-                    st.error(f"❌ Erreur: {data['erreur']}")
+                if "erreur" in export:
+                    st.error(f"❌ Erreur: {export['erreur']}")
                     return
                 
-                filename = f"progression_programme_{prog_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+                filename = f"progression_programme_{prog_id}_{_horodatage_fichier()}.json"
                 
                 st.download_button(
                     label="💾 Télécharger le fichier JSON",
-                    data=json_data,
+                    data=export["donnees"],
                     file_name=filename,
                     mime="application/json",
                     use_container_width=True
@@ -808,8 +1487,8 @@ def interface_export_streamlit(db, prog_id):
                 st.success(f"✅ Export réussi !")
                 
                 # Statistiques selon le type
-                if "statistiques" in data:
-                    stats = data["statistiques"]
+                if export["statistiques"]:
+                    stats = export["statistiques"]
                     if "nombre_semaines" in stats:
                         st.info(f"📊 {stats['nombre_semaines']} semaine(s), {stats['nombre_contenus']} contenu(s)")
                     elif "nombre_seances" in stats:
@@ -830,10 +1509,29 @@ def interface_import_streamlit(db):
         help="Sélectionnez un fichier JSON de programme exporté"
     )
     
+    # Import lancé lors d'une exécution précédente : résultat lu sans attendre l'écrivain
+    en_cours = st.session_state.get('_import_programme_en_cours')
+    if en_cours is not None:
+        if not en_cours.done():
+            st.info("⏳ Import en cours...")
+            st.button("🔄 Actualiser", key="actualiser_import_programme")
+            return None
+        
+        del st.session_state['_import_programme_en_cours']
+        succes, message, prog_id = en_cours.result()
+        
+        if succes:
+            st.success(message)
+            st.balloons()
+            return prog_id
+        st.error(message)
+        return None
+    
     if fichier is not None:
         try:
-            contenu = fichier.read().decode('utf-8')
-            data = json.loads(contenu)
+            # Octets du fichier décodés directement (orjson si disponible), sans str intermédiaire
+            contenu = fichier.read()
+            data = _charger_json(contenu)
             valide, erreurs = valider_structure_json(data)
             
             if not valide:
@@ -848,16 +1546,11 @@ def interface_import_streamlit(db):
                     st.write(f"**Description:** {data['programme'].get('description', 'N/A')}")
             
             if st.button("✅ Importer le programme", type="primary"):
-                with st.spinner("Import en cours..."):
-                    succes, message, prog_id = importer_programme(db, contenu)
-                    
-                    if succes:
-                        st.success(message)
-                        st.balloons()
-                        return prog_id
-                    else:
-                        st.error(message)
-                        return None
+                # Import confié à l'écrivain ; son résultat est affiché aux exécutions suivantes
+                st.session_state['_import_programme_en_cours'] = _soumettre_ecriture(
+                    importer_programme, db, data
+                )
+                st.rerun()
         
         except json.JSONDecodeError:
             st.error("❌ Le fichier n'est pas un JSON valide")
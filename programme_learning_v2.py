@@ -228,6 +228,19 @@ class ProgressionDAO:
             return dict(row)
         return None
     
+    def get_progression_batch(self, contenu_ids: List[str]) -> Dict[str, Dict]:
+        """Récupère la progression de plusieurs contenus en une seule requête"""
+        if not contenu_ids:
+            return {}
+        
+        placeholders = ",".join("?" * len(contenu_ids))
+        cursor = self._get_cursor()
+        cursor.execute(f"""
+            SELECT * FROM progression WHERE contenu_id IN ({placeholders})
+        """, tuple(contenu_ids))
+        
+        return {row['contenu_id']: dict(row) for row in cursor.fetchall()}
+    
     def marquer_commence(self, contenu_id: str):
         """Marque un contenu comme commencé"""
         cursor = self._get_cursor()
@@ -579,9 +592,15 @@ class ProgrammeService:
         """Suggère le prochain contenu à étudier"""
         cursor = self.db.conn.cursor()  # ✅ Créer un nouveau cursor
         
-        # Trouver les contenus non commencés avec prérequis validés
+        # Contenus non commencés, avec le nombre de prérequis non validés calculé en SQL
+        # (au lieu d'une vérification des prérequis par candidat)
         cursor.execute("""
-            SELECT c.*
+            SELECT c.*,
+                   (SELECT COUNT(*)
+                    FROM prerequis pr
+                    LEFT JOIN progression pp ON pp.contenu_id = pr.prerequis_contenu_id
+                    WHERE pr.contenu_id = c.id
+                      AND (pp.statut IS NULL OR pp.statut != 'termine')) as nb_prerequis_non_valides
             FROM contenus c
             JOIN jours j ON c.jour_id = j.id
             JOIN semaines s ON j.semaine_id = s.id
@@ -595,14 +614,63 @@ class ProgrammeService:
         candidats = [dict(row) for row in cursor.fetchall()]
         cursor.close()  # ✅ Fermer le cursor
         
-        # Trouver le premier avec tous les prérequis validés
-        for contenu in candidats:
-            prerequis_ok, _ = self.verifier_prerequis(contenu['id'])
-            if prerequis_ok or not self.contenu_dao.get_prerequis(contenu['id']):
-                return contenu
+        if not candidats:
+            return None
+        
+        # Le premier dont tous les prérequis sont validés (ou sans prérequis),
+        # sinon le premier quand même
+        prochain = next((c for c in candidats if c['nb_prerequis_non_valides'] == 0), candidats[0])
+        del prochain['nb_prerequis_non_valides']
+        return prochain
+    
+    def get_home_bundle(self, prog_id: str) -> Optional[Dict]:
+        """
+        Rassemble toutes les données de la page d'accueil dans une seule transaction
+        de lecture (un instantané cohérent de la base)
+        
+        Returns:
+            Dict avec 'programme' (stats de structure incluses), 'prochain',
+            'statut_prochain' et 'prerequis' (avec 'statut_progression'),
+            ou None si le programme est introuvable
+        """
+        conn = self.db.conn
+        debut_lecture = not conn.in_transaction
+        if debut_lecture:
+            conn.execute("BEGIN")
+        
+        try:
+            prog = self.prog_dao.get_programme_with_stats(prog_id)
+            if not prog:
+                return None
+            
+            bundle = {
+                'programme': prog,
+                'prochain': None,
+                'statut_prochain': None,
+                'prerequis': []
+            }
+            
+            prochain = self.suggerer_prochain_contenu(prog_id)
+            if prochain:
+                # Progression du contenu suggéré et de ses prérequis en une requête
+                prerequis = self.contenu_dao.get_prerequis(prochain['id'])
+                progressions = self.prog_dao_user.get_progression_batch(
+                    [prochain['id']] + [prereq['id'] for prereq in prerequis]
+                )
+                
+                for prereq in prerequis:
+                    prereq['statut_progression'] = progressions.get(prereq['id'], {}).get('statut')
+                
+                bundle['prochain'] = prochain
+                bundle['statut_prochain'] = progressions.get(prochain['id'], {}).get('statut')
+                bundle['prerequis'] = prerequis
+            
+            return bundle
         
-        # Si aucun trouvé, retourner le premier quand même
-        return candidats[0] if candidats else None
+        finally:
+            if debut_lecture:
+                # Fin de la transaction de lecture (aucune écriture à valider)
+                conn.commit()
 
 
 class ProgressionService: